@@ -11,7 +11,7 @@ setup(
         "deluge_client",
         "loguru",
         "more_itertools",
-        "requests_cache",
+        "requests_cache>=1.0",
         "tqdm",
         "yarl",
     ],
@@ -20,6 +20,7 @@ setup(
             "deluge-rename=torrent_tools.scripts.deluge_rename:cli",
             "ops-index=torrent_tools.scripts.ops_index:cli",
             "btn-index=torrent_tools.scripts.btn_index:cli",
+            "torrent-cache=torrent_tools.scripts.cache:cli",
         ],
     },
 )
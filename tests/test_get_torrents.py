@@ -0,0 +1,79 @@
+from re import IGNORECASE, compile
+
+import pytest
+
+from torrent_tools.deluge import get_torrents
+from torrent_tools.deluge.get_torrents import exact_values
+
+TORRENTS = [
+    (b"a", b"One", b"opsfet.ch", b"music"),
+    (b"b", b"Two", b"flacsfor.me", b"music"),
+    (b"c", b"Three", b"myanonamouse.net", b"books"),
+]
+
+
+class Client:
+    def __init__(self):
+        self.filter_dict = None
+
+    def call(self, method, filter_dict, keys):
+        self.filter_dict = filter_dict
+        return {
+            hash: {
+                b"hash": hash,
+                b"name": name,
+                b"tracker_host": tracker,
+                b"label": label,
+            }
+            for hash, name, tracker, label in TORRENTS
+        }
+
+
+@pytest.mark.parametrize(
+    "pattern, values",
+    [
+        (r"^opsfet\.ch$", ["opsfet.ch"]),
+        (r"(music|books)$", ["music", "books"]),
+        (r"^(?:a|b)$", ["a", "b"]),
+        (r"^music|books$", None),
+        (r"(a)|(b)$", None),
+        (r"^opsfet.ch$", None),
+        (r"^music", None),
+        (r"music\$", None),
+    ],
+)
+def test_exact_values(pattern, values):
+    assert exact_values(compile(pattern)) == values
+
+
+def test_exact_values_ignorecase():
+    assert exact_values(compile(r"^music$", IGNORECASE)) is None
+
+
+def test_single_tracker_is_pushed_down():
+    client = Client()
+    get_torrents(client, tracker=compile(r"^opsfet\.ch$"))
+    assert client.filter_dict == {"tracker_host": ["opsfet.ch"]}
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [r"^(opsfet\.ch|flacsfor\.me)$", r"^Error$"],
+)
+def test_tracker_alternation_is_matched_locally(pattern):
+    client = Client()
+    torrents = get_torrents(client, tracker=compile(pattern))
+    assert client.filter_dict == {}
+    assert [t.hash for t in torrents] == (["a", "b"] if "|" in pattern else [])
+
+
+def test_label_alternation_is_pushed_down():
+    client = Client()
+    get_torrents(client, label=compile(r"^(music|books)$"))
+    assert client.filter_dict == {"label": ["music", "books"]}
+
+
+def test_names_intersect_exact_name():
+    client = Client()
+    get_torrents(client, name=compile(r"^One$"), names=["One", "Two"])
+    assert client.filter_dict == {"name": ["One"]}
@@ -0,0 +1,62 @@
+from json import dumps
+
+import pytest
+
+from torrent_tools.stream import MissingKey, iter_values
+
+DOCUMENT = {
+    "status": "success",
+    "response": {
+        "seeding": [
+            {"groupId": 1, "name": "Ünïcödé ☃", "size": 123456789},
+            {"groupId": 2, "name": "Two", "tags": ["a", "b"]},
+            12345,
+            "three",
+        ]
+    },
+}
+
+
+def chunked(text, size):
+    data = text.encode("utf-8")
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 2**16])
+def test_array_across_chunk_sizes(size):
+    chunks = chunked(dumps(DOCUMENT, ensure_ascii=False), size)
+    assert list(iter_values(chunks, "seeding")) == DOCUMENT["response"]["seeding"]
+
+
+@pytest.mark.parametrize("size", [1, 5, 2**16])
+def test_object_values(size):
+    document = {"result": {"torrents": {"1": {"id": 1}, "2": {"id": 2}}}}
+    chunks = chunked(dumps(document, indent=2), size)
+    assert list(iter_values(chunks, "torrents")) == [{"id": 1}, {"id": 2}]
+
+
+@pytest.mark.parametrize("text", ['{"seeding": []}', '{"seeding" : { } }'])
+def test_empty(text):
+    assert list(iter_values(chunked(text, 1), "seeding")) == []
+
+
+def test_trailing_number_is_not_cut_short():
+    chunks = [b'{"seeding": [1', b"23", b"45]}"]
+    assert list(iter_values(chunks, "seeding")) == [12345]
+
+
+def test_missing_key_raises_document():
+    with pytest.raises(MissingKey) as missing:
+        list(iter_values(chunked('{"status": "failure", "error": "x"}', 4), "seeding"))
+    assert missing.value.document == {"status": "failure", "error": "x"}
+
+
+def test_long_listing_is_compacted():
+    items = [{"id": i, "name": "x" * 100} for i in range(5000)]
+    chunks = chunked(dumps({"seeding": items}), 4096)
+    assert list(iter_values(chunks, "seeding")) == items
+
+
+def test_malformed_listing():
+    with pytest.raises(ValueError):
+        list(iter_values([b'{"seeding": [1 2]}'], "seeding"))
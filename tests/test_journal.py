@@ -0,0 +1,56 @@
+from os.path import join
+
+from torrent_tools.deluge import Torrent, apply_operations
+from torrent_tools.plan import plan_operations
+from torrent_tools.store import APPLIED, PLANNED, Journal
+
+
+class Client:
+    def __init__(self):
+        self.calls = []
+
+    def call_many(self, calls, window=1):
+        self.calls.extend(calls)
+        return [None for _ in calls]
+
+
+def test_rename_files_round_trip(tmp_path):
+    torrent = Torrent("abc", "Old Name", "ops", None, "localhost:58846")
+    operations = plan_operations(
+        [
+            {
+                "action": "rename",
+                "name": "Old Name",
+                "choice": 1,
+                "candidates": ["Néw Name"],
+                "torrents": [torrent],
+            }
+        ],
+        {"abc": {0: "Old Name.flac"}},
+    )
+
+    path = join(tmp_path, "journal.jsonl")
+    with Journal(path) as journal:
+        journal.append(PLANNED, operations)
+
+    with Journal(path) as journal:
+        pending = journal.pending()
+        assert sorted(o["method"] for o in pending) == [
+            "core.force_recheck",
+            "core.rename_files",
+        ]
+
+        client = Client()
+        results = apply_operations(client, pending)
+        assert all(err is None for _, err in results)
+        assert client.calls[0] == (
+            "core.rename_files",
+            ["abc", [(0, "Néw Name.flac".encode("utf-8"))]],
+        )
+        journal.append(
+            APPLIED,
+            [o for o, _ in results if o["method"] != "core.force_recheck"],
+        )
+
+    with Journal(path) as journal:
+        assert [o["method"] for o in journal.pending()] == ["core.force_recheck"]
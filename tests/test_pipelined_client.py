@@ -0,0 +1,119 @@
+from asyncio import (
+    get_running_loop,
+    new_event_loop,
+    open_connection,
+    run_coroutine_threadsafe,
+    sleep,
+    start_server,
+)
+from struct import pack, unpack
+from sys import modules
+from threading import Thread
+from time import monotonic
+from zlib import compress, decompress
+
+import pytest
+from deluge_client.client import RemoteException
+from deluge_client.rencode import dumps, loads
+
+from torrent_tools.deluge import PipelinedDelugeClient
+
+
+def message(*values):
+    body = compress(dumps(values))
+    return pack("!BI", 1, len(body)) + body
+
+
+async def handle(reader, writer):
+    # "sleep" answers after args[0] milliseconds, so later calls overtake
+    # it; "trickle" sends its response a piece at a time; "hang" never
+    # answers
+    try:
+        while True:
+            _, length = unpack("!BI", await reader.readexactly(5))
+            for request_id, method, args, _ in loads(
+                decompress(await reader.readexactly(length))
+            ):
+                if method == b"sleep":
+
+                    async def answer(request_id=request_id, ms=args[0]):
+                        await sleep(ms / 1000)
+                        writer.write(message(1, request_id, ms))
+
+                    get_running_loop().create_task(answer())
+                elif method == b"trickle":
+                    data = message(1, request_id, b"x" * 10000)
+                    for i in range(0, len(data), len(data) // 4 + 1):
+                        await sleep(args[0] / 1000)
+                        writer.write(data[i : i + len(data) // 4 + 1])
+                        await writer.drain()
+                elif method == b"fail":
+                    writer.write(
+                        message(
+                            2, request_id, b"KeyError", [b"no such torrent"], {}, b""
+                        )
+                    )
+                elif method != b"hang":
+                    writer.write(message(1, request_id, method))
+    except Exception:
+        writer.close()
+
+
+loop = new_event_loop()
+
+
+@pytest.fixture(scope="module")
+def port():
+    server = loop.run_until_complete(start_server(handle, "127.0.0.1", 0))
+    Thread(target=loop.run_forever, daemon=True).start()
+    yield server.sockets[0].getsockname()[1]
+    server.close()
+    # lets the handlers see the last client hang up before the loop stops
+    run_coroutine_threadsafe(sleep(0.1), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+@pytest.fixture
+def client(port, monkeypatch):
+    # the fake daemon speaks plain TCP
+    monkeypatch.setattr(
+        modules["torrent_tools.deluge.async_client"],
+        "open_connection",
+        lambda host, port, ssl: open_connection(host, port),
+    )
+    client = PipelinedDelugeClient("127.0.0.1", port, "user", "pass", timeout=1)
+    client.connect()
+    yield client
+    client.disconnect()
+
+
+def test_connect(client):
+    assert client.connected
+    assert client.fallback is None
+
+
+def test_calls_are_pipelined(client):
+    started = monotonic()
+    results = client.call_many([("sleep", [500]), ("sleep", [100]), ("x", [])] * 4)
+    assert results == [500, 100, b"x"] * 4
+    assert monotonic() - started < 1
+
+
+def test_remote_error_in_place(client):
+    results = client.call_many([("a", []), ("fail", []), ("b", [])])
+    assert results[0] == b"a" and results[2] == b"b"
+    assert isinstance(results[1], RemoteException)
+    assert type(results[1]).__name__ == "KeyError"
+
+
+def test_idle_timeout(client):
+    started = monotonic()
+    with pytest.raises(TimeoutError):
+        client.call("hang")
+    assert 1 <= monotonic() - started < 2
+
+
+def test_slow_response_still_arriving_is_not_cut_off(client):
+    started = monotonic()
+    assert client.call("trickle", 400) == b"x" * 10000
+    assert monotonic() - started > 1
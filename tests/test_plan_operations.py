@@ -0,0 +1,55 @@
+from torrent_tools.deluge import Torrent
+from torrent_tools.plan import plan_operations
+
+
+def plan(torrents, files, action="rename"):
+    return plan_operations(
+        [
+            {
+                "action": action,
+                "name": "Old Name",
+                "choice": 1,
+                "candidates": ["New Name"],
+                "torrents": torrents,
+            }
+        ],
+        files,
+    )
+
+
+def test_single_file_and_folder_renames():
+    operations = plan(
+        [
+            Torrent("abc", "Old Name", "ops", None, "a:1"),
+            Torrent("def", "Old Name", "ops", None, "b:1"),
+        ],
+        {
+            "abc": {0: "Old Name.flac"},
+            "def": {0: "Old Name/01.flac", 1: "Old Name/02.flac"},
+        },
+    )
+    assert [(o["hash"], o["method"], o["args"]) for o in operations] == [
+        ("abc", "core.rename_files", ["abc", [(0, "New Name.flac")]]),
+        ("def", "core.rename_folder", ["def", "Old Name", "New Name"]),
+        ("abc", "core.force_recheck", [["abc"]]),
+        ("def", "core.force_recheck", [["def"]]),
+    ]
+
+
+def test_no_recheck_without_file_list():
+    operations = plan(
+        [
+            Torrent("abc", "Old Name", "ops", None, "a:1"),
+            Torrent("def", "Old Name", "ops", None, "a:1"),
+        ],
+        {"abc": {0: "Old Name.flac"}},
+    )
+    assert [(o["hash"], o["method"]) for o in operations] == [
+        ("abc", "core.rename_files"),
+        ("abc", "core.force_recheck"),
+    ]
+
+
+def test_only_rename_entries_are_planned():
+    torrents = [Torrent("abc", "Old Name", "ops", None, "a:1")]
+    assert plan(torrents, {"abc": {0: "x.flac"}}, action="review") == []
@@ -0,0 +1,120 @@
+from json import dumps
+
+import pytest
+
+from torrent_tools.deluge import Torrent
+from torrent_tools.deluge.bencode import decode, items, skip
+from torrent_tools.deluge.read_state import get_tracker_host, read_state
+
+
+def bencode(value):
+    if isinstance(value, int):
+        return b"i%de" % value
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    if isinstance(value, bytes):
+        return b"%d:%s" % (len(value), value)
+    if isinstance(value, list):
+        return b"l" + b"".join(bencode(v) for v in value) + b"e"
+    return (
+        b"d"
+        + b"".join(bencode(k) + bencode(v) for k, v in sorted(value.items()))
+        + b"e"
+    )
+
+
+def test_decode_round_trip():
+    value = {b"a": [1, -2, b"x"], b"b": {b"c": b""}, b"d": 0}
+    data = bencode(value)
+    assert decode(data) == (value, len(data))
+    assert skip(data, 0) == len(data)
+
+
+def test_decode_spec_skips_other_keys():
+    data = bencode({b"info": {b"name": b"n", b"pieces": b"x" * 1000}, b"z": 1})
+    assert decode(data, 0, {b"info": {b"name": None}})[0] == {b"info": {b"name": b"n"}}
+    assert decode(data, 0, {b"*": {b"name": None}})[0] == {
+        b"info": {b"name": b"n"},
+        b"z": 1,
+    }
+
+
+def test_items():
+    data = bencode({b"a": 1, b"b": [2]})
+    assert [(k, decode(data, i)[0]) for k, i in items(data)] == [
+        (b"a", 1),
+        (b"b", [2]),
+    ]
+
+
+def test_truncated():
+    with pytest.raises(ValueError):
+        decode(bencode([1, 2])[:-1])
+
+
+@pytest.mark.parametrize(
+    "announce, host",
+    [
+        ("https://home.opsfet.ch/abc/announce", "opsfet.ch"),
+        ("https://flacsfor.me/abc/announce", "flacsfor.me"),
+        ("https://tracker.example.co.uk/announce", "example.co.uk"),
+        ("https://tracker.example.com.au/announce", "example.com.au"),
+        ("https://a.b.example.uk/announce", "b.example.uk"),
+        ("http://10.0.0.1:8080/announce", "10.0.0.1"),
+    ],
+)
+def test_get_tracker_host(announce, host):
+    assert get_tracker_host(announce) == host
+
+
+def test_read_state(tmp_path):
+    state = tmp_path / "state"
+    state.mkdir()
+    (state / "aaaa.torrent").write_bytes(
+        bencode(
+            {
+                "announce": "https://home.opsfet.ch/x/announce",
+                "info": {"name": "Single.flac", "length": 10, "pieces": "p"},
+            }
+        )
+    )
+    (state / "bbbb.torrent").write_bytes(
+        bencode(
+            {
+                "announce": "https://flacsfor.me/x/announce",
+                "info": {
+                    "name": "Album",
+                    "files": [
+                        {"path": ["01.flac"], "length": 1},
+                        {"path": ["CD2", "02.flac"], "length": 1},
+                    ],
+                },
+            }
+        )
+    )
+    (state / "empty.torrent").write_bytes(b"")
+    (state / "torrents.fastresume").write_bytes(
+        bencode(
+            {
+                "bbbb": bencode(
+                    {
+                        "mapped_files": ["", "Album\\CD2\\02 Renamed.flac"],
+                        "trackers": [["https://tracker.example.co.uk/announce"]],
+                    }
+                )
+            }
+        )
+    )
+    (tmp_path / "label.conf").write_text(
+        dumps({"file": 1, "format": 1}) + dumps({"torrent_labels": {"aaaa": "music"}})
+    )
+
+    torrents, files = read_state(str(state), daemon="a:1")
+    assert torrents == [
+        Torrent("aaaa", "Single.flac", "opsfet.ch", "music", "a:1"),
+        Torrent("bbbb", "Album", "example.co.uk", "", "a:1"),
+    ]
+    assert files == {
+        "aaaa": {0: "Single.flac"},
+        "bbbb": {0: "Album/01.flac", 1: "Album/CD2/02 Renamed.flac"},
+    }
@@ -0,0 +1,73 @@
+from sys import modules
+
+import pytest
+
+from torrent_tools.ratelimit import TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        # a real sleep always lets some time pass
+        self.now += max(seconds, 1e-6)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    module = modules["torrent_tools.ratelimit.token_bucket"]
+    monkeypatch.setattr(module, "monotonic", clock.monotonic)
+    monkeypatch.setattr(module, "sleep", clock.sleep)
+    return clock
+
+
+def acquire(bucket, clock, count):
+    times = []
+    for _ in range(count):
+        bucket.acquire()
+        times.append(clock.now)
+    return times
+
+
+@pytest.mark.parametrize("value", ["5/2", "5/10", "1/2", "150/3600"])
+def test_rate_holds_in_every_window(clock, value):
+    bucket = TokenBucket.parse(value)
+    times = acquire(bucket, clock, bucket.rate * 3)
+    for start in times:
+        in_window = [t for t in times if start <= t < start + bucket.per]
+        assert len(in_window) <= bucket.rate
+
+
+def test_first_window_is_not_doubled(clock):
+    bucket = TokenBucket.parse("5/2")
+    times = acquire(bucket, clock, 10)
+    assert len([t for t in times if t < times[0] + 2]) == 5
+
+
+def test_idle_bucket_does_not_burst(clock):
+    bucket = TokenBucket.parse("5/10")
+    acquire(bucket, clock, 5)
+    clock.now += 3600
+    times = acquire(bucket, clock, 10)
+    assert len([t for t in times if t < times[0] + 10]) == 5
+
+
+def test_block_delays_every_caller(clock):
+    bucket = TokenBucket.parse("5/10")
+    bucket.acquire()
+    started = clock.now
+    bucket.block(30)
+    bucket.acquire()
+    assert clock.now >= started + 30
+
+
+def test_parse():
+    bucket = TokenBucket.parse("150/3600")
+    assert (bucket.rate, bucket.per) == (150, 3600)
+    assert str(bucket) == "150/3600"
+    assert TokenBucket.parse(bucket) is bucket
@@ -1,3 +1,4 @@
+from datetime import timedelta
 from appdirs import user_config_dir
 from yarl import URL
 
@@ -7,12 +8,66 @@ ORPHEUS_ENDPOINT = URL("https://orpheus.network/")
 REDACTED_ENDPOINT = URL("https://redacted.ch/")
 USER_AGENT = "torrenttools/0.0.1"
 
+# requests/seconds, per tracker API documentation
+BTN_RATE = "150/3600"
+MAM_RATE = "1/2"
+ORPHEUS_RATE = "5/10"
+REDACTED_RATE = "5/10"
+
+# connect,read seconds before a tracker request is abandoned and retried
+BTN_TIMEOUT = "10,60"
+MAM_TIMEOUT = "10,30"
+ORPHEUS_TIMEOUT = "10,30"
+REDACTED_TIMEOUT = "10,30"
+
 DELUGE_PORT = 58846
 DELUGE_USERNAME = "deluge"
 FILTER = r".*"
+JOBS = 4
+RPC_JOBS = 32
+# seconds the Deluge daemon may go without sending anything while calls wait
+RPC_TIMEOUT = 20
+VERIFY_SAMPLE = 8
+RECHECK_BYTES = None
+RECHECKS_PER_PATH = 2
+
+# seconds to wait for a burst of added torrents to settle, and between
+# full sweeps, in --watch mode
+DEBOUNCE = 10
+RECONCILE = 3600
 
 CONFIG = user_config_dir("torrenttools")
 
+# tracker responses are cached for CACHE_TTLS, or CACHE_EXPIRE for anything
+# else, with least recently used responses evicted beyond any size limits
+# given, which only the sqlite backend supports
+CACHE_BACKEND = "sqlite"
+CACHE_EXPIRE = timedelta(days=2)
+CACHE_MAX_ENTRIES = None
+CACHE_MAX_SIZE = None
+CACHE_TTLS = {
+    "flacsfor.me": timedelta(weeks=4),
+    "opsfet.ch": timedelta(weeks=4),
+    "myanonamouse.net": timedelta(hours=12),
+}
+
+# user torrent lists ops-index catalogues
+INDEX_TYPES = ["seeding", "snatched"]
+
+# bump when a tracker's naming rules change to invalidate its stored names
+NAMING_RULES_VERSIONS = {
+    "flacsfor.me": 2,
+    "opsfet.ch": 2,
+    "myanonamouse.net": 2,
+}
+
+# how long each kind of failed lookup is remembered before it is retried
+FAILURE_TTLS = {
+    "auth": timedelta(hours=1),
+    "not-found": timedelta(days=30),
+    "transient": timedelta(0),
+}
+
 RELEASE_TYPE_NAMES = {
     "flacsfor.me": {
         0: "Software",
@@ -47,3 +102,39 @@ RELEASE_TYPE_NAMES = {
     },
     "myanonamouse.net": {},
 }
+
+# str.format templates per tracker and release type, "*" matching any
+# release type; see gazelle.FIELDS and mam.FIELDS for the fields
+GAZELLE_TEMPLATES = {
+    **{
+        t: "{releaseTypeName} - {remasterYear} - {name}"
+        "{remaster}{catalogueNumber}{format}"
+        for t in [
+            "Compilation",
+            "Soundtrack",
+        ]
+    },
+    **{
+        t: "{artist} - {releaseTypeName} - {year} - {name}"
+        "{remaster}{catalogueNumber}{format}"
+        for t in [
+            "Album",
+            "Anthology",
+            "Bootleg",
+            "Concert Recording",
+            "DJ Mix",
+            "EP",
+            "Live Album",
+            "Mixtape",
+            "Remix",
+            "Single",
+        ]
+    },
+}
+NAMING_TEMPLATES = {
+    "flacsfor.me": GAZELLE_TEMPLATES,
+    "opsfet.ch": GAZELLE_TEMPLATES,
+    "myanonamouse.net": {
+        "*": "{authors} - {title} {{{id}}}",
+    },
+}
@@ -0,0 +1,3 @@
+from .get_result import get_result  # noqa: F401
+from .index_torrents import index_torrents  # noqa: F401
+from .stream_result import stream_result  # noqa: F401
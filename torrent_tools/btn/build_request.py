@@ -0,0 +1,17 @@
+def build_request(
+    method,
+    params,
+    endpoint,
+    api_key,
+):
+    return {
+        "url": endpoint,
+        "json": {
+            "method": method,
+            "params": [api_key, *params],
+            "id": 1,
+        },
+        "headers": {
+            "Authorization": f"token {api_key}",
+        },
+    }
@@ -0,0 +1,31 @@
+from ..resolve import get_json
+from ..resolve.failure import TRANSIENT, LookupFailure
+from .build_request import build_request
+from .raise_error import raise_error
+
+
+def get_result(
+    method,
+    params,
+    endpoint,
+    api_key,
+    session,
+    rate_limit=None,
+    timeout=None,
+):
+    result = get_json(
+        session,
+        build_request(method, params, endpoint, api_key),
+        rate_limit=rate_limit,
+        method="POST",
+        timeout=timeout,
+    )
+
+    raise_error(result)
+    if "result" not in result or result["result"] is None:
+        raise LookupFailure(
+            TRANSIENT,
+            "No result received",
+        )
+
+    return result["result"]
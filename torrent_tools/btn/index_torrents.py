@@ -0,0 +1,74 @@
+from loguru import logger
+from .get_result import get_result
+from .stream_result import stream_result
+
+
+def index_torrents(
+    catalog,
+    tracker,
+    endpoint,
+    api_key,
+    session,
+    rate_limit=None,
+    timeout=None,
+    page_size=1000,
+    refresh=False,
+    on_record=None,
+):
+    logger.info(
+        f"Indexing snatched torrents on {tracker}, last synced "
+        f"{catalog.get_synced(tracker, 'snatched')}"
+    )
+    offset = 0
+    while True:
+        # the page is streamed, keeping only the entries not yet catalogued
+        count = 0
+        new = []
+        for t in stream_result(
+            "getUserSnatchlist",
+            [page_size, offset],
+            "torrents",
+            endpoint,
+            api_key,
+            session,
+            rate_limit=rate_limit,
+            timeout=timeout,
+        ):
+            count += 1
+            if refresh or not catalog.has_torrent(tracker, t["TorrentID"]):
+                new.append(t)
+        for torrent in new:
+            # snatchlist entries may lack the infohash and group
+            if not torrent.get("InfoHash"):
+                torrent = {
+                    **torrent,
+                    **get_result(
+                        "getTorrentById",
+                        [torrent["TorrentID"]],
+                        endpoint,
+                        api_key,
+                        session,
+                        rate_limit=rate_limit,
+                        timeout=timeout,
+                    ),
+                }
+            group = {
+                "id": torrent["GroupID"],
+                "name": torrent.get("GroupName"),
+                "series": torrent.get("Series"),
+            }
+            catalog.add(
+                tracker,
+                group,
+                [torrent],
+                hash_key="InfoHash",
+                id_key="TorrentID",
+            )
+            if on_record is not None:
+                on_record(tracker, group, [torrent])
+        logger.debug(f"{len(new)} new of {count} snatched torrents at {offset}")
+        # a page with nothing new ends an incremental sync
+        if count < page_size or not new:
+            break
+        offset += page_size
+    catalog.put_synced(tracker, "snatched")
@@ -0,0 +1,11 @@
+from ..resolve.failure import LookupFailure, classify_message
+
+
+def raise_error(
+    result,
+):
+    if result.get("error") is not None:
+        raise LookupFailure(
+            classify_message(result["error"].get("message")),
+            f'Error {result.get("error")}, expected none',
+        )
@@ -0,0 +1,27 @@
+from ..resolve import stream_json
+from .build_request import build_request
+from .raise_error import raise_error
+
+
+def stream_result(
+    method,
+    params,
+    key,
+    endpoint,
+    api_key,
+    session,
+    rate_limit=None,
+    timeout=None,
+):
+    # like get_result, but yields the values of result[key] as they are
+    # parsed rather than holding the whole body; an empty snatchlist comes
+    # back without any torrents, so a missing key only fails on an error
+    return stream_json(
+        session,
+        build_request(method, params, endpoint, api_key),
+        key,
+        raise_error,
+        rate_limit=rate_limit,
+        method="POST",
+        timeout=timeout,
+    )
@@ -0,0 +1,4 @@
+from .cache_session import CacheSession  # noqa: F401
+from .get_stats import get_stats  # noqa: F401
+from .open_cache import open_cache  # noqa: F401
+from .prune_cache import prune_cache  # noqa: F401
@@ -0,0 +1,62 @@
+from threading import Lock
+from time import time
+from requests_cache import CachedSession, SQLiteCache
+
+from .prune_cache import prune_cache
+
+
+class CacheSession(CachedSession):
+    def __init__(
+        self,
+        *args,
+        max_entries=None,
+        max_size=None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.max_entries = max_entries
+        self.max_size = max_size
+        # requests_cache doesn't record reads, so hits are noted here and
+        # written to an access table beside the responses when closing
+        self.accessed = {}
+        self.accessed_lock = Lock()
+        if self.lru:
+            with self.cache.responses.connection(commit=True) as con:
+                con.execute(
+                    "CREATE TABLE IF NOT EXISTS access "
+                    "(key TEXT PRIMARY KEY, accessed REAL NOT NULL)"
+                )
+
+    @property
+    def lru(self):
+        return isinstance(self.cache, SQLiteCache)
+
+    def send(
+        self,
+        request,
+        **kwargs,
+    ):
+        response = super().send(request, **kwargs)
+        key = getattr(response, "cache_key", None)
+        if key is not None and self.lru:
+            with self.accessed_lock:
+                self.accessed[key] = time()
+        return response
+
+    def flush(self):
+        with self.accessed_lock:
+            accessed, self.accessed = self.accessed, {}
+        if accessed and self.lru:
+            with self.cache.responses.connection(commit=True) as con:
+                con.executemany(
+                    "INSERT OR REPLACE INTO access VALUES (?, ?)",
+                    accessed.items(),
+                )
+
+    def close(self):
+        # sessions opened without limits, such as torrent-cache stats and
+        # warm, leave expired responses for an explicit prune
+        self.flush()
+        if self.max_entries is not None or self.max_size is not None:
+            prune_cache(self, max_entries=self.max_entries, max_size=self.max_size)
+        super().close()
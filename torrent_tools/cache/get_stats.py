@@ -0,0 +1,29 @@
+from os.path import getsize
+from requests_cache import SQLiteCache
+
+
+def get_stats(
+    session,
+):
+    cache = session.cache
+    if isinstance(cache, SQLiteCache):
+        with cache.responses.connection() as con:
+            size = con.execute(
+                "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM responses"
+            ).fetchone()[0]
+        entries = cache.count()
+        fresh = cache.count(expired=False)
+    else:
+        paths = list(cache.paths())
+        size = sum(getsize(p) for p in paths)
+        entries = len(paths)
+        fresh = len(list(cache.filter(valid=True, expired=False)))
+    return {
+        "backend": type(cache).__name__,
+        "path": str(
+            cache.db_path if isinstance(cache, SQLiteCache) else cache.cache_dir
+        ),
+        "entries": entries,
+        "expired": entries - fresh,
+        "size": size,
+    }
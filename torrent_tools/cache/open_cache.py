@@ -0,0 +1,36 @@
+from os.path import join
+from requests_cache import FileCache, SQLiteCache
+
+from .cache_session import CacheSession
+
+
+def open_cache(
+    config,
+    backend,
+    expire_after,
+    urls_expire_after=None,
+    max_entries=None,
+    max_size=None,
+):
+    if backend == "sqlite":
+        cache = SQLiteCache(
+            join(config, "http_cache.sqlite"),
+            wal=True,
+            busy_timeout=60000,
+        )
+    else:
+        cache = FileCache(config)
+    return CacheSession(
+        backend=cache,
+        cache_control=False,
+        expire_after=expire_after,
+        urls_expire_after=urls_expire_after,
+        allowable_methods=[
+            "GET",
+        ],
+        # tracker APIs answer errors with a 200, which mustn't be kept for
+        # as long as real metadata
+        filter_fn=lambda r: b'"error"' not in r.content[:256],
+        max_entries=max_entries,
+        max_size=max_size,
+    )
@@ -0,0 +1,51 @@
+from loguru import logger
+from requests_cache import SQLiteCache
+
+
+def prune_cache(
+    session,
+    max_entries=None,
+    max_size=None,
+    vacuum=False,
+):
+    # expired responses go first, then the least recently used until the
+    # cache is within max_entries responses and max_size bytes; responses
+    # never read since access tracking began count as least recently used
+    if isinstance(session.cache, SQLiteCache):
+        session.cache.delete(expired=True, vacuum=False)
+    else:
+        session.cache.delete(expired=True)
+    if max_entries is None and max_size is None:
+        return 0
+    if not isinstance(session.cache, SQLiteCache):
+        logger.warning("Size limits need the sqlite cache backend, not pruning")
+        return 0
+
+    with session.cache.responses.connection() as con:
+        rows = con.execute(
+            """
+            SELECT responses.key, LENGTH(responses.value)
+            FROM responses LEFT JOIN access ON access.key = responses.key
+            ORDER BY COALESCE(access.accessed, 0), responses.expires
+            """
+        ).fetchall()
+    entries = len(rows)
+    size = sum(length for _, length in rows)
+    evict = []
+    for key, length in rows:
+        if (max_entries is None or entries <= max_entries) and (
+            max_size is None or size <= max_size
+        ):
+            break
+        evict.append(key)
+        entries -= 1
+        size -= length
+
+    if evict:
+        logger.info(f"Evicting {len(evict)} least recently used cached responses")
+        session.cache.delete(*evict, vacuum=vacuum)
+    elif vacuum:
+        session.cache.responses.vacuum()
+    with session.cache.responses.connection(commit=True) as con:
+        con.execute("DELETE FROM access WHERE key NOT IN (SELECT key FROM responses)")
+    return len(evict)
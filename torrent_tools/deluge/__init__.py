@@ -0,0 +1,11 @@
+from .apply_operations import apply_operations  # noqa: F401
+from .async_client import AsyncDelugeClient  # noqa: F401
+from .get_files import get_files  # noqa: F401
+from .get_torrents import get_torrents  # noqa: F401
+from .group_torrents import decode_torrents, group_torrents  # noqa: F401
+from .pipelined_client import PipelinedDelugeClient  # noqa: F401
+from .read_events import read_events  # noqa: F401
+from .read_state import read_state  # noqa: F401
+from .schedule_rechecks import schedule_rechecks  # noqa: F401
+from .torrent import Torrent  # noqa: F401
+from .watch_torrents import watch_torrents  # noqa: F401
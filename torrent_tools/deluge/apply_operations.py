@@ -0,0 +1,64 @@
+from loguru import logger
+from more_itertools import chunked
+
+from .get_files import CHUNK_SIZE
+
+RECHECK = "core.force_recheck"
+RENAME_FILES = "core.rename_files"
+
+
+def encode_args(
+    operation,
+):
+    # operations stay JSON-serialisable for plans and the journal, so the new
+    # file names are only encoded on their way to Deluge
+    if operation["method"] != RENAME_FILES:
+        return operation["args"]
+    hash, renames = operation["args"]
+    return [hash, [(index, name.encode("utf-8")) for index, name in renames]]
+
+
+def apply_operations(
+    client,
+    operations,
+    jobs=1,
+    chunk_size=CHUNK_SIZE,
+):
+    # renames are pipelined on the client's connection with up to jobs in
+    # flight; rechecks are coalesced into list calls once every rename for
+    # that hash succeeded
+    renames = [o for o in operations if o["method"] != RECHECK]
+    results = [
+        (operation, result if isinstance(result, Exception) else None)
+        for operation, result in zip(
+            renames,
+            client.call_many(
+                [(o["method"], encode_args(o)) for o in renames],
+                window=jobs,
+            ),
+        )
+    ]
+
+    failed = {o["hash"] for o, err in results if err is not None}
+    rechecks = [o for o in operations if o["method"] == RECHECK]
+    chunks = list(chunked([o for o in rechecks if o["hash"] not in failed], chunk_size))
+    for chunk, result in zip(
+        chunks,
+        client.call_many(
+            [(RECHECK, [[o["hash"] for o in chunk]]) for chunk in chunks],
+            window=jobs,
+        ),
+    ):
+        results.extend(
+            (o, result if isinstance(result, Exception) else None) for o in chunk
+        )
+
+    for operation, err in results:
+        if err is not None:
+            logger.error(f"{operation['method']} failed for {operation['hash']}: {err}")
+    logger.info(
+        f"Applied {len([r for r in results if r[1] is None])} operation(s), "
+        f"{len([r for r in results if r[1] is not None])} failed, "
+        f"{len([o for o in rechecks if o['hash'] in failed])} recheck(s) skipped"
+    )
+    return results
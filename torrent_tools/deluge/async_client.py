@@ -0,0 +1,179 @@
+from asyncio import (
+    IncompleteReadError,
+    Semaphore,
+    create_task,
+    gather,
+    get_running_loop,
+    open_connection,
+    wait,
+    wait_for,
+)
+from ssl import CERT_NONE, PROTOCOL_TLS_CLIENT, SSLContext
+from struct import pack, unpack
+from zlib import compress, decompress
+from deluge_client.client import (
+    MESSAGE_HEADER_SIZE,
+    RPC_ERROR,
+    RPC_EVENT,
+    RPC_RESPONSE,
+    ConnectionLostException,
+    RemoteException,
+)
+from deluge_client.rencode import dumps, loads
+from loguru import logger
+
+PROTOCOL_VERSION = 1
+
+
+def decode(
+    value,
+):
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "ignore")
+    return str(value)
+
+
+class AsyncDelugeClient:
+    # speaks the Deluge 2 RPC protocol and matches responses to requests
+    # by id, so any number of calls can be in flight on one connection;
+    # timeout is how long the daemon may go without sending anything while
+    # calls are waiting, so large listings are not cut off while they stream
+    def __init__(
+        self,
+        host,
+        port,
+        username,
+        password,
+        timeout=20,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.request_id = 0
+        self.pending = {}
+        self.received = 0
+        self.receiver = None
+        self.writer = None
+        self.connected = False
+
+    async def connect(self):
+        context = SSLContext(PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = CERT_NONE
+        logger.trace(f"Connecting to {self.host}:{self.port}")
+        self.reader, self.writer = await wait_for(
+            open_connection(self.host, self.port, ssl=context),
+            self.timeout,
+        )
+        self.receiver = create_task(self.receive())
+        await self.call(
+            "daemon.login",
+            self.username,
+            self.password,
+            client_version="deluge-client",
+        )
+        self.connected = True
+
+    async def disconnect(self):
+        # also closes a connection whose login failed
+        self.connected = False
+        if self.receiver is not None:
+            self.receiver.cancel()
+            self.receiver = None
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.writer = None
+
+    async def call(
+        self,
+        method,
+        *args,
+        **kwargs,
+    ):
+        self.request_id += 1
+        request_id = self.request_id
+        future = get_running_loop().create_future()
+        self.pending[request_id] = future
+
+        body = compress(dumps(((request_id, method, args, kwargs),)))
+        self.writer.write(pack("!BI", PROTOCOL_VERSION, len(body)) + body)
+        await self.writer.drain()
+        sent = get_running_loop().time()
+        try:
+            while not future.done():
+                if self.timeout is None:
+                    await wait([future])
+                    continue
+                idle = get_running_loop().time() - max(sent, self.received)
+                if idle >= self.timeout:
+                    raise TimeoutError(
+                        f"{method} got no response from {self.host}:{self.port} "
+                        f"for {self.timeout} seconds"
+                    )
+                await wait([future], timeout=self.timeout - idle)
+            return future.result()
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def call_many(
+        self,
+        calls,
+        window=64,
+    ):
+        # returns results in call order, with exceptions in place of
+        # results for calls that failed
+        semaphore = Semaphore(window)
+
+        async def call(method, args):
+            async with semaphore:
+                return await self.call(method, *args)
+
+        return await gather(
+            *[call(method, args) for method, args in calls],
+            return_exceptions=True,
+        )
+
+    async def receive(self):
+        try:
+            while True:
+                header = await self.reader.readexactly(MESSAGE_HEADER_SIZE)
+                self.received = get_running_loop().time()
+                _, length = unpack("!BI", header)
+                body = bytearray()
+                while len(body) < length:
+                    chunk = await self.reader.read(length - len(body))
+                    if not chunk:
+                        raise IncompleteReadError(bytes(body), length)
+                    body += chunk
+                    self.received = get_running_loop().time()
+                message = list(loads(decompress(bytes(body))))
+                if message[0] == RPC_EVENT:
+                    continue
+                future = self.pending.get(message[1])
+                if future is None or future.done():
+                    continue
+                if message[0] == RPC_RESPONSE:
+                    future.set_result(message[2])
+                elif message[0] == RPC_ERROR:
+                    exception_type, exception_msg, _, traceback = message[2:]
+                    future.set_exception(
+                        type(
+                            decode(exception_type),
+                            (RemoteException,),
+                            {},
+                        )(
+                            "{}\n{}".format(
+                                ", ".join(decode(m) for m in exception_msg),
+                                decode(traceback),
+                            )
+                        )
+                    )
+        except (IncompleteReadError, ConnectionError) as err:
+            logger.error(f"Lost connection to {self.host}:{self.port}: {err}")
+            self.connected = False
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionLostException())
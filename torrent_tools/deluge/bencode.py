@@ -0,0 +1,74 @@
+# a minimal bencode decoder that walks a buffer (bytes or mmap) in place,
+# decoding only the keys named in a spec and skipping everything else,
+# so large values such as info.pieces are never copied
+
+
+def skip(
+    buffer,
+    index,
+):
+    token = buffer[index : index + 1]
+    if not token:
+        raise ValueError(f"unexpected end of data at {index}")
+    if token == b"i":
+        return buffer.find(b"e", index) + 1
+    if token in [b"l", b"d"]:
+        index += 1
+        while buffer[index : index + 1] != b"e":
+            index = skip(buffer, index)
+        return index + 1
+    colon = buffer.find(b":", index)
+    return colon + 1 + int(buffer[index:colon])
+
+
+def decode(
+    buffer,
+    index=0,
+    spec=None,
+):
+    # spec None decodes the value fully; a dict spec decodes only the named
+    # keys of a dict value, recursing with each key's own spec, and the key
+    # "*" applies its spec to every key
+    token = buffer[index : index + 1]
+    if not token:
+        raise ValueError(f"unexpected end of data at {index}")
+    if token == b"i":
+        end = buffer.find(b"e", index)
+        return int(buffer[index + 1 : end]), end + 1
+    if token == b"l":
+        values = []
+        index += 1
+        while buffer[index : index + 1] != b"e":
+            value, index = decode(buffer, index, spec)
+            values.append(value)
+        return values, index + 1
+    if token == b"d":
+        values = {}
+        index += 1
+        while buffer[index : index + 1] != b"e":
+            key, index = decode(buffer, index)
+            if spec is None or key in spec or b"*" in spec:
+                values[key], index = decode(
+                    buffer,
+                    index,
+                    None if spec is None else spec.get(key, spec.get(b"*")),
+                )
+            else:
+                index = skip(buffer, index)
+        return values, index + 1
+    colon = buffer.find(b":", index)
+    end = colon + 1 + int(buffer[index:colon])
+    return bytes(buffer[colon + 1 : end]), end
+
+
+def items(
+    buffer,
+    index=0,
+):
+    # yields (key, value index) for each entry of the dict at index, so
+    # callers can decode one value at a time
+    index += 1
+    while buffer[index : index + 1] != b"e":
+        key, index = decode(buffer, index)
+        yield key, index
+        index = skip(buffer, index)
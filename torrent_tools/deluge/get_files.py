@@ -0,0 +1,24 @@
+from loguru import logger
+from more_itertools import chunked
+
+# keeps each status response to a few megabytes on torrents with large file lists
+CHUNK_SIZE = 500
+
+
+def get_files(
+    client,
+    hashes,
+    chunk_size=CHUNK_SIZE,
+):
+    files = {}
+    for chunk in chunked(sorted(set(hashes)), chunk_size):
+        logger.trace(f"Fetching file lists for {len(chunk)} torrent(s)")
+        for hash, status in client.call(
+            "core.get_torrents_status",
+            {"id": chunk},
+            ["files"],
+        ).items():
+            files[hash.decode("utf-8")] = {
+                p[b"index"]: p[b"path"].decode("utf-8") for p in status[b"files"]
+            }
+    return files
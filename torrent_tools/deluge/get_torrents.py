@@ -0,0 +1,100 @@
+from re import IGNORECASE, fullmatch, sub
+from loguru import logger
+
+from .group_torrents import decode_torrents
+
+MATCH_ALL = [".*", ""]
+
+# a run of literal characters, allowing backslash-escaped punctuation
+LITERAL = r"(?:[^.^$*+?{}\[\]()|\\]|\\[^A-Za-z0-9])+"
+
+
+def exact_values(
+    pattern,
+):
+    # returns the literal values of an anchored pattern such as
+    # "^opsfet\.ch$" or "(music|books)$", None for anything else
+    if pattern.flags & IGNORECASE:
+        return None
+    source = pattern.pattern.removeprefix("^")
+    if not source.endswith("$") or source.endswith("\\$"):
+        return None
+    source = source[:-1]
+    # "^a|b$" means "^a" or "b$", so alternatives are only exact when the
+    # anchors apply to a group around all of them
+    grouped = False
+    for prefix in ["(?:", "("]:
+        if source.startswith(prefix) and source.endswith(")"):
+            source = source[len(prefix) : -1]
+            grouped = True
+            break
+    alternatives = source.split("|")
+    if len(alternatives) > 1 and not grouped:
+        return None
+    if not all(fullmatch(LITERAL, a) for a in alternatives):
+        return None
+    return [sub(r"\\(.)", r"\1", a) for a in alternatives]
+
+
+def get_torrents(
+    client,
+    name=None,
+    label=None,
+    tracker=None,
+    state=None,
+    added_since=None,
+    min_size=None,
+    max_size=None,
+    hashes=None,
+    names=None,
+    daemon=None,
+):
+    # exact matches are pushed into Deluge's filter dict so only matching
+    # torrents are transferred; regexes and ranges are applied locally
+    filter_dict = {}
+    patterns = []
+    for key, field, pattern in [
+        ("name", "name", name),
+        ("label", "label", label),
+        ("tracker_host", "tracker", tracker),
+    ]:
+        if pattern is None or pattern.pattern in MATCH_ALL:
+            continue
+        values = exact_values(pattern)
+        # Deluge's tracker_host filter only compares the first value, and
+        # treats "Error" as torrents with a tracker error
+        if key == "tracker_host" and values is not None:
+            if len(values) != 1 or values[0] == "Error":
+                values = None
+        if values is None:
+            patterns.append((field, pattern))
+        else:
+            filter_dict[key] = values
+    if state:
+        filter_dict["state"] = list(state)
+    if hashes is not None:
+        filter_dict["id"] = sorted(hashes)
+    if names is not None:
+        filter_dict["name"] = sorted(
+            n for n in names if n in filter_dict.get("name", names)
+        )
+
+    keys = ["hash", "name", "tracker_host", "label"]
+    if added_since is not None:
+        keys.append("time_added")
+    if min_size is not None or max_size is not None:
+        keys.append("total_size")
+
+    logger.trace(f"Listing torrents with filter {filter_dict} and keys {keys}")
+    status = [
+        a
+        for a in client.call("core.get_torrents_status", filter_dict, keys).values()
+        if (added_since is None or a[b"time_added"] >= added_since.timestamp())
+        and (min_size is None or a[b"total_size"] >= min_size)
+        and (max_size is None or a[b"total_size"] <= max_size)
+    ]
+    return [
+        t
+        for t in decode_torrents(status, daemon=daemon)
+        if all(pattern.match(getattr(t, field)) for field, pattern in patterns)
+    ]
@@ -0,0 +1,43 @@
+from loguru import logger
+
+from .torrent import Torrent
+
+
+def decode_torrents(
+    torrent_status,
+    daemon=None,
+):
+    return [
+        Torrent(
+            hash=a[b"hash"].decode("utf-8"),
+            name=a[b"name"].decode("utf-8"),
+            tracker=a[b"tracker_host"].decode("utf-8"),
+            label=a[b"label"].decode("utf-8"),
+            daemon=daemon,
+        )
+        for a in torrent_status
+    ]
+
+
+def group_torrents(
+    torrents,
+):
+    groups = {}
+    for torrent in torrents:
+        groups.setdefault(torrent.name, []).append(torrent)
+
+    directories = []
+    for name in sorted(groups):
+        # the same infohash seeded on several daemons isn't a duplicate
+        trackers = [t.tracker for t in {t.hash: t for t in groups[name]}.values()]
+        for tracker in sorted({t for t in trackers if trackers.count(t) > 1}):
+            logger.warning(
+                f"{name} has {trackers.count(tracker)} torrents from {tracker}"
+            )
+        directories.append(
+            {
+                "name": name,
+                "torrents": groups[name],
+            }
+        )
+    return directories
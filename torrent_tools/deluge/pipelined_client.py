@@ -0,0 +1,108 @@
+from asyncio import TimeoutError as AsyncTimeoutError
+from asyncio import new_event_loop, run_coroutine_threadsafe
+from threading import Lock, Thread
+
+from deluge_client import DelugeRPCClient
+from deluge_client.client import DelugeClientException, RemoteException
+from loguru import logger
+
+from .async_client import AsyncDelugeClient
+
+
+class PipelinedDelugeClient:
+    # a blocking façade over AsyncDelugeClient, call() can be used from any
+    # number of threads at once and the calls share one connection; daemons
+    # that don't answer a Deluge 2 login are retried with DelugeRPCClient,
+    # which also speaks Deluge 1.x but makes one call at a time
+    def __init__(
+        self,
+        host,
+        port,
+        username,
+        password,
+        timeout=20,
+    ):
+        self.client = AsyncDelugeClient(host, port, username, password, timeout)
+        self.fallback = None
+        self.lock = Lock()
+        self.loop = new_event_loop()
+        self.thread = Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def connected(self):
+        if self.fallback is not None:
+            return self.fallback.connected
+        return self.client.connected
+
+    def run(
+        self,
+        coroutine,
+    ):
+        return run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def connect(self):
+        try:
+            self.run(self.client.connect())
+            return
+        except RemoteException:
+            raise
+        except (AsyncTimeoutError, OSError, DelugeClientException) as err:
+            self.run(self.client.disconnect())
+            logger.warning(
+                f"{self.client.host}:{self.client.port} did not answer a "
+                f"Deluge 2 login ({err!r}), retrying without pipelining"
+            )
+        fallback = DelugeRPCClient(
+            self.client.host,
+            self.client.port,
+            self.client.username,
+            self.client.password,
+            timeout=self.client.timeout,
+        )
+        try:
+            fallback.connect()
+        except (OSError, DelugeClientException) as err:
+            raise ConnectionError(
+                f"Could not log in to {self.client.host}:{self.client.port} "
+                f"as a Deluge 2 or Deluge 1.x daemon: {err!r}"
+            ) from err
+        logger.info(
+            f"Connected to Deluge {fallback.deluge_version} daemon at "
+            f"{self.client.host}:{self.client.port}, calls will not be pipelined"
+        )
+        self.fallback = fallback
+
+    def disconnect(self):
+        if self.fallback is not None:
+            with self.lock:
+                self.fallback.disconnect()
+        self.run(self.client.disconnect())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    def call(
+        self,
+        method,
+        *args,
+        **kwargs,
+    ):
+        if self.fallback is not None:
+            with self.lock:
+                return self.fallback.call(method, *args, **kwargs)
+        return self.run(self.client.call(method, *args, **kwargs))
+
+    def call_many(
+        self,
+        calls,
+        window=64,
+    ):
+        if self.fallback is None:
+            return self.run(self.client.call_many(calls, window=window))
+        results = []
+        for method, args in calls:
+            try:
+                results.append(self.call(method, *args))
+            except Exception as err:
+                results.append(err)
+        return results
@@ -0,0 +1,44 @@
+from socket import timeout
+from ssl import SSLError
+from struct import unpack
+from zlib import decompress
+from deluge_client.client import (
+    MESSAGE_HEADER_SIZE,
+    RPC_EVENT,
+    ConnectionLostException,
+)
+from deluge_client.rencode import loads
+
+READ_SIZE = 4096
+
+
+def read_events(
+    client,
+    poll=1,
+):
+    # DelugeRPCClient discards event messages, so once interest is
+    # registered the connection's socket is read directly; None is
+    # yielded every poll seconds without traffic so callers can do timed work
+    assert client.deluge_version == 2, "events require a Deluge 2 daemon"
+    length_format = "!i" if client.deluge_protocol_version is None else "!I"
+    client._socket.settimeout(poll)
+    buffer = b""
+    while True:
+        try:
+            data = client._socket.recv(READ_SIZE)
+        except (timeout, SSLError):
+            yield None
+            continue
+        if not data:
+            raise ConnectionLostException()
+
+        buffer += data
+        while len(buffer) >= MESSAGE_HEADER_SIZE:
+            length = unpack(length_format, buffer[1:MESSAGE_HEADER_SIZE])[0]
+            if len(buffer) < MESSAGE_HEADER_SIZE + length:
+                break
+            end = MESSAGE_HEADER_SIZE + length
+            message = list(loads(decompress(buffer[MESSAGE_HEADER_SIZE:end])))
+            buffer = buffer[end:]
+            if message[0] == RPC_EVENT:
+                yield message[1].decode("utf-8"), message[2]
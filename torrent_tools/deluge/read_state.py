@@ -0,0 +1,138 @@
+from ipaddress import ip_address
+from json import JSONDecoder
+from mmap import ACCESS_READ, mmap
+from os import listdir
+from os.path import dirname, exists, getsize, join, normpath, splitext
+from loguru import logger
+from yarl import URL
+
+from .bencode import decode, items
+from .torrent import Torrent
+
+TORRENT_SPEC = {
+    b"announce": None,
+    b"announce-list": None,
+    b"info": {
+        b"name": None,
+        b"length": None,
+        b"files": {b"path": None},
+    },
+}
+RESUME_SPEC = {
+    b"mapped_files": None,
+    b"trackers": None,
+}
+SECOND_LEVEL = ["co", "com", "net", "org"]
+
+
+def get_tracker_host(
+    announce,
+):
+    # mirrors Deluge's tracker_host, the last two labels of the hostname or
+    # three for hosts such as tracker.example.co.uk
+    host = URL(announce).host or ""
+    try:
+        ip_address(host)
+        return host
+    except ValueError:
+        pass
+    labels = host.split(".")
+    if len(labels) > 2 and (labels[-2] in SECOND_LEVEL or labels[-1] == "uk"):
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def read_labels(
+    path,
+):
+    # Deluge config files are a format header followed by the config itself
+    if not exists(path):
+        return {}
+    with open(path) as f:
+        text = f.read()
+    decoder = JSONDecoder()
+    _, end = decoder.raw_decode(text)
+    config, _ = decoder.raw_decode(text[end:].lstrip())
+    return config.get("torrent_labels", {})
+
+
+def read_fastresume(
+    path,
+):
+    if not exists(path) or getsize(path) == 0:
+        return {}
+    resume = {}
+    with open(path, "rb") as f, mmap(f.fileno(), 0, access=ACCESS_READ) as buffer:
+        for hash, index in items(buffer):
+            data, _ = decode(buffer, index)
+            resume[hash.decode("utf-8")], _ = decode(data, 0, RESUME_SPEC)
+    return resume
+
+
+def read_state(
+    state_dir,
+    daemon=None,
+):
+    # returns the same Torrent records and {hash: {index: path}} file lists
+    # as the RPC path, read from the .torrent files Deluge keeps in its
+    # state directory, with renames taken from the fastresume data
+    state_dir = normpath(state_dir)
+    labels = read_labels(join(dirname(state_dir), "label.conf"))
+    resume = read_fastresume(join(state_dir, "torrents.fastresume"))
+
+    torrents = []
+    files = {}
+    for filename in sorted(listdir(state_dir)):
+        path = join(state_dir, filename)
+        if not filename.endswith(".torrent") or getsize(path) == 0:
+            continue
+        hash = splitext(filename)[0].lower()
+        with open(path, "rb") as f:
+            with mmap(f.fileno(), 0, access=ACCESS_READ) as buffer:
+                try:
+                    metadata, _ = decode(buffer, 0, TORRENT_SPEC)
+                except ValueError as err:
+                    logger.error(f"Unable to parse {path}: {err}")
+                    continue
+
+        info = metadata.get(b"info", {})
+        name = info.get(b"name", b"").decode("utf-8", "replace")
+        if b"files" in info:
+            paths = {
+                index: "/".join(
+                    [name] + [p.decode("utf-8", "replace") for p in f[b"path"]]
+                )
+                for index, f in enumerate(info[b"files"])
+            }
+        else:
+            paths = {0: name}
+        mapped_files = resume.get(hash, {}).get(b"mapped_files", [])
+        for index, mapped in enumerate(mapped_files):
+            if mapped:
+                paths[index] = mapped.decode("utf-8", "replace").replace("\\", "/")
+
+        # Deluge announces to the trackers in the fastresume data, which
+        # include any edits made after the torrent was added
+        announces = [
+            a for tier in resume.get(hash, {}).get(b"trackers", []) for a in tier
+        ]
+        if not announces:
+            if b"announce" in metadata:
+                announces.append(metadata[b"announce"])
+            for tier in metadata.get(b"announce-list", []):
+                announces.extend(tier)
+
+        files[hash] = paths
+        torrents.append(
+            Torrent(
+                hash=hash,
+                name=paths[0].split("/", 1)[0],
+                tracker=(
+                    get_tracker_host(announces[0].decode("utf-8")) if announces else ""
+                ),
+                label=labels.get(hash, ""),
+                daemon=daemon,
+            )
+        )
+    logger.debug(f"Read {len(torrents)} torrent(s) from {state_dir}")
+    return torrents, files
@@ -0,0 +1,90 @@
+from collections import deque
+from time import monotonic, sleep
+
+from loguru import logger
+
+CHECKING = b"Checking"
+
+
+def schedule_rechecks(
+    client,
+    hashes,
+    max_bytes=None,
+    max_per_path=None,
+    poll=5,
+    grace=3,
+):
+    # admits rechecks while the bytes being checked stay under max_bytes and
+    # each save path has fewer than max_per_path checks running, polling
+    # Deluge to see when they finish; without limits every recheck is
+    # issued at once and nothing is awaited
+    if not hashes:
+        return
+    if max_bytes is None and not max_per_path:
+        logger.info(f" - Rechecking {len(hashes)} torrent(s)")
+        client.call("core.force_recheck", list(hashes))
+        return
+
+    status = client.call(
+        "core.get_torrents_status",
+        {"id": sorted(hashes)},
+        ["save_path", "total_size"],
+    )
+    queue = deque(
+        (hash.decode("utf-8"), s[b"save_path"], s[b"total_size"])
+        for hash, s in status.items()
+    )
+    active = {}
+    started = monotonic()
+    checked = 0
+    while queue or active:
+        admitted = []
+        for torrent in list(queue):
+            hash, save_path, size = torrent
+            in_flight = sum(a["size"] for a in active.values())
+            on_path = len([a for a in active.values() if a["path"] == save_path])
+            if active and max_bytes is not None and in_flight + size > max_bytes:
+                continue
+            if max_per_path and on_path >= max_per_path:
+                continue
+            queue.remove(torrent)
+            active[hash] = {
+                "path": save_path,
+                "size": size,
+                "polls": 0,
+                "seen": False,
+            }
+            admitted.append(hash)
+        if admitted:
+            logger.info(f" - Rechecking {', '.join(admitted)}")
+            client.call("core.force_recheck", admitted)
+
+        sleep(poll)
+        polled = {
+            hash.decode("utf-8"): s
+            for hash, s in client.call(
+                "core.get_torrents_status",
+                {"id": sorted(active)},
+                ["state"],
+            ).items()
+        }
+        # torrents removed from Deluge mid-check drop out of the status
+        for hash in [h for h in active if h not in polled]:
+            del active[hash]
+        for hash, s in polled.items():
+            torrent = active[hash]
+            torrent["polls"] += 1
+            if s[b"state"] == CHECKING:
+                torrent["seen"] = True
+                continue
+            # a recheck that never showed as Checking finished between polls
+            if torrent["seen"] or torrent["polls"] >= grace:
+                checked += torrent["size"]
+                del active[hash]
+
+        elapsed = monotonic() - started
+        logger.info(
+            f"Rechecked {checked / 2**30:.1f} GiB in {elapsed:.0f}s "
+            f"({checked / 2**20 / elapsed:.1f} MiB/s), "
+            f"{len(active)} checking, {len(queue)} queued"
+        )
@@ -0,0 +1,7 @@
+from collections import namedtuple
+
+Torrent = namedtuple(
+    "Torrent",
+    ["hash", "name", "tracker", "label", "daemon"],
+    defaults=[None],
+)
@@ -0,0 +1,47 @@
+from time import monotonic, sleep
+from loguru import logger
+from deluge_client.client import DelugeClientException
+
+from .read_events import read_events
+
+EVENTS = ["TorrentAddedEvent", "TorrentFinishedEvent"]
+
+
+def watch_torrents(
+    connect,
+    callback,
+    debounce=10,
+    reconcile=3600,
+    retry=60,
+):
+    # callback receives the set of new hashes once no event has arrived for
+    # debounce seconds, or None every reconcile seconds for a full sweep
+    while True:
+        try:
+            client = connect()
+            client.call("daemon.set_event_interest", EVENTS)
+            logger.info(f"Watching for {', '.join(EVENTS)}")
+            callback(None)
+            pending = set()
+            last_event = last_reconcile = monotonic()
+            for event in read_events(client):
+                now = monotonic()
+                if event is not None:
+                    name, args = event
+                    # torrents loaded from state at daemon startup are left
+                    # to the next reconcile
+                    if name == "TorrentAddedEvent" and args[1]:
+                        continue
+                    logger.debug(f"{name} for {args[0].decode('utf-8')}")
+                    pending.add(args[0].decode("utf-8"))
+                    last_event = now
+                    continue
+                if pending and now - last_event >= debounce:
+                    callback(pending)
+                    pending = set()
+                if now - last_reconcile >= reconcile:
+                    callback(None)
+                    last_reconcile = monotonic()
+        except (DelugeClientException, OSError) as err:
+            logger.error(f"Lost Deluge event connection: {err}, retrying in {retry}s")
+            sleep(retry)
@@ -1 +1,6 @@
-from .get_name import get_name  # noqa: F401
+from .clean_filename import clean_filename  # noqa: F401
+from .fields import FIELDS  # noqa: F401
+from .get_name import get_group, get_name  # noqa: F401
+from .group_cache import GroupCache  # noqa: F401
+from .index_torrents import index_torrents  # noqa: F401
+from .stream_response import stream_response  # noqa: F401
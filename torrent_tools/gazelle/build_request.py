@@ -0,0 +1,13 @@
+def build_request(
+    params,
+    endpoint,
+    api_key,
+    user_agent,
+):
+    return {
+        "url": endpoint / "ajax.php" % params,
+        "headers": {
+            "User-Agent": user_agent,
+            "Authorization": api_key,
+        },
+    }
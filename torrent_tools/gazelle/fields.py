@@ -0,0 +1,48 @@
+from more_itertools import first
+
+CATALOGUE_NUMBER = str.maketrans("", "", "()[]{}- ")
+
+
+def get_catalogue_number(record):
+    number = record["torrent"]["remasterCatalogueNumber"]
+    if number in [0, None, ""]:
+        number = record["group"]["catalogueNumber"]
+    number = (number or "").translate(CATALOGUE_NUMBER)
+    return f" {{{number}}}" if number else ""
+
+
+def get_format(record):
+    format = " ".join(
+        v
+        for v in [
+            record["torrent"]["media"],
+            record["torrent"]["format"],
+            record["torrent"]["encoding"],
+        ]
+        if v is not None
+    )
+    return f' [{format.replace(" Lossless", "").replace(" (VBR)", "")}]'
+
+
+def get_remaster_year(record):
+    if not record["useRemasterYear"] and record["torrent"]["remasterYear"] in [
+        0,
+        None,
+        "",
+    ]:
+        return record["group"]["year"]
+    return record["torrent"]["remasterYear"]
+
+
+FIELDS = {
+    "artist": lambda r: first(r["group"]["musicInfo"]["artists"])["name"],
+    "catalogueNumber": get_catalogue_number,
+    "format": get_format,
+    "name": lambda r: r["group"]["name"],
+    "releaseTypeName": lambda r: r["releaseTypeName"],
+    "remaster": lambda r: (
+        f' ({r["torrent"]["remasterTitle"]})' if r["torrent"]["remasterTitle"] else ""
+    ),
+    "remasterYear": get_remaster_year,
+    "year": lambda r: r["group"]["year"],
+}
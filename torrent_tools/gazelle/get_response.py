@@ -0,0 +1,35 @@
+from ..resolve import get_json
+from ..resolve.failure import TRANSIENT, LookupFailure
+from .build_request import build_request
+from .raise_error import raise_error
+
+
+def get_response(
+    params,
+    endpoint,
+    api_key,
+    user_agent,
+    session,
+    rate_limit=None,
+    timeout=None,
+):
+    result = get_json(
+        session,
+        build_request(params, endpoint, api_key, user_agent),
+        rate_limit=rate_limit,
+        timeout=timeout,
+    )
+
+    raise_error(result)
+    if "status" not in result or result["status"] != "success":
+        raise LookupFailure(
+            TRANSIENT,
+            f'Status of {result.get("status")}, expected success',
+        )
+    if "response" not in result or result["response"] is None:
+        raise LookupFailure(
+            TRANSIENT,
+            "No response received",
+        )
+
+    return result["response"]
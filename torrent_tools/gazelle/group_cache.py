@@ -0,0 +1,50 @@
+from threading import Lock
+
+
+class GroupCache:
+    def __init__(
+        self,
+        catalog=None,
+        tracker=None,
+    ):
+        self.lock = Lock()
+        self.groups = {}
+        self.torrents = {}
+        # groups fetched during a run are also written to the catalog, and
+        # anything the indexer catalogued is served without a request
+        self.catalog = catalog
+        self.tracker = tracker
+
+    def add(
+        self,
+        group,
+        torrents,
+        persist=True,
+    ):
+        # torrents without an infoHash can't be matched, callers fall back
+        # to a per-torrent lookup for those
+        with self.lock:
+            self.groups[group["id"]] = group
+            for torrent in torrents:
+                if torrent.get("infoHash"):
+                    self.torrents[torrent["infoHash"].lower()] = (
+                        group["id"],
+                        torrent,
+                    )
+        if persist and self.catalog is not None:
+            self.catalog.add(self.tracker, group, torrents)
+
+    def get(
+        self,
+        hash,
+    ):
+        with self.lock:
+            if hash.lower() in self.torrents:
+                group_id, torrent = self.torrents[hash.lower()]
+                return self.groups[group_id], torrent
+        if self.catalog is None:
+            return None
+        cached = self.catalog.get(self.tracker, hash)
+        if cached is not None:
+            self.add(cached[0], [cached[1]], persist=False)
+        return cached
@@ -0,0 +1,85 @@
+from loguru import logger
+from .get_response import get_response
+from .stream_response import stream_response
+
+
+def index_torrents(
+    catalog,
+    tracker,
+    endpoint,
+    api_key,
+    user_agent,
+    session,
+    types,
+    rate_limit=None,
+    timeout=None,
+    page_size=500,
+    refresh=False,
+    on_record=None,
+):
+    user_id = get_response(
+        {"action": "index"},
+        endpoint,
+        api_key,
+        user_agent,
+        session,
+        rate_limit=rate_limit,
+        timeout=timeout,
+    )["id"]
+
+    fetched = set()
+    for type in types:
+        logger.info(
+            f"Indexing {type} torrents on {tracker}, last synced "
+            f"{catalog.get_synced(tracker, type)}"
+        )
+        offset = 0
+        while True:
+            # pages are streamed, keeping only the ids of new groups
+            count = 0
+            new = []
+            for t in stream_response(
+                {
+                    "action": "user_torrents",
+                    "id": user_id,
+                    "type": type,
+                    "limit": page_size,
+                    "offset": offset,
+                },
+                type,
+                endpoint,
+                api_key,
+                user_agent,
+                session,
+                rate_limit=rate_limit,
+                timeout=timeout,
+            ):
+                count += 1
+                if t["groupId"] in fetched or t["groupId"] in new:
+                    continue
+                if refresh or not catalog.has_torrent(tracker, t["torrentId"]):
+                    new.append(t["groupId"])
+            # one torrentgroup request catalogues every torrent in the group
+            for group_id in new:
+                response = get_response(
+                    {"action": "torrentgroup", "id": group_id},
+                    endpoint,
+                    api_key,
+                    user_agent,
+                    session,
+                    rate_limit=rate_limit,
+                    timeout=timeout,
+                )
+                catalog.add(tracker, response["group"], response["torrents"])
+                if on_record is not None:
+                    on_record(tracker, response["group"], response["torrents"])
+                fetched.add(group_id)
+            logger.debug(
+                f"{len(new)} new groups in {count} {type} torrents at offset {offset}"
+            )
+            # lists are newest first, so a page with nothing new ends an
+            # incremental sync
+            if count < page_size or not new:
+                break
+            offset += page_size
+        catalog.put_synced(tracker, type)
@@ -0,0 +1,11 @@
+from ..resolve.failure import LookupFailure, classify_message
+
+
+def raise_error(
+    result,
+):
+    if "error" in result:
+        raise LookupFailure(
+            classify_message(result.get("error")),
+            f'Error {result.get("error")}, expected none',
+        )
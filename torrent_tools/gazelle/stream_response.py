@@ -0,0 +1,33 @@
+from ..resolve import stream_json
+from ..resolve.failure import TRANSIENT, LookupFailure
+from .build_request import build_request
+from .raise_error import raise_error
+
+
+def stream_response(
+    params,
+    key,
+    endpoint,
+    api_key,
+    user_agent,
+    session,
+    rate_limit=None,
+    timeout=None,
+):
+    # like get_response, but yields the items of response[key] as they are
+    # parsed rather than holding the whole body
+    def on_missing(result):
+        raise_error(result)
+        raise LookupFailure(
+            TRANSIENT,
+            f"No {key} received",
+        )
+
+    return stream_json(
+        session,
+        build_request(params, endpoint, api_key, user_agent),
+        key,
+        on_missing,
+        rate_limit=rate_limit,
+        timeout=timeout,
+    )
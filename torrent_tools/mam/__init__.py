@@ -1 +1,4 @@
+from .clean_filename import clean_filename  # noqa: F401
+from .fields import FIELDS  # noqa: F401
 from .get_name import get_name  # noqa: F401
+from .get_rows import get_rows  # noqa: F401
@@ -0,0 +1,15 @@
+from json import loads
+
+
+def get_authors(record):
+    authors = list(loads(record["author_info"]).values())
+    if len(authors) > 1:
+        return "{} and {}".format(", ".join(authors[:-1]), authors[-1])
+    return authors[0]
+
+
+FIELDS = {
+    "authors": get_authors,
+    "id": lambda r: r["id"],
+    "title": lambda r: r["title"],
+}
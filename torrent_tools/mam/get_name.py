@@ -1,9 +1,16 @@
-from json import dumps, loads
+from json import dumps
 from more_itertools import first
-from time import sleep
 from loguru import logger
 from requests import HTTPError
-from .clean_filename import clean_filename
+from ..naming import render
+from ..ratelimit import send
+from ..resolve.failure import (
+    NOT_FOUND,
+    TRANSIENT,
+    classify_message,
+    classify_status,
+    fail,
+)
 
 
 def get_name(
@@ -13,9 +20,23 @@ def get_name(
     api_key,
     user_agent,
     session,
+    renderers,
+    rate_limit=None,
+    timeout=None,
+    on_failure=None,
+    offline=False,
+    rows=None,
     *args,
     **kwargs,
 ):
+    # rows found by a batch lookup need no request of their own
+    if rows is not None and hash.lower() in rows:
+        return render(renderers, rows[hash.lower()]) or name
+
+    # nothing from this tracker is catalogued
+    if offline:
+        return fail(name, on_failure, NOT_FOUND, f"{hash} is not in the catalog")
+
     get = {
         "url": endpoint
         / "tor"
@@ -34,8 +55,7 @@ def get_name(
 
     logger.trace(get)
     try:
-        r = session.get(**get)
-        r.raise_for_status()
+        r = send(session, get, rate_limit=rate_limit, timeout=timeout)
         assert r.headers.get(
             "content-type"
         ).startswith(
@@ -43,22 +63,19 @@ def get_name(
         ), f'content-type was {r.headers.get("content-type")}, expected application/json'
         result = r.json()
     except HTTPError as http_err:
-        logger.error(f"HTTP error occurred: {http_err}, sleeping 60 seconds")
-        logger.trace(r.text)
-        sleep(60)
-        return get_name(
-            hash,
+        return fail(
             name,
-            endpoint,
-            api_key,
-            user_agent,
-            session,
-            *args,
-            **kwargs,
+            on_failure,
+            classify_status(http_err.response.status_code),
+            f"HTTP error occurred: {http_err}",
         )
     except Exception as err:
-        logger.error(f"Other error occurred: {err}")
-        return name
+        return fail(
+            name,
+            on_failure,
+            TRANSIENT,
+            f"Other error occurred: {err}",
+        )
 
     logger.trace("Received {0} bytes from API".format(len(r.content)))
     logger.trace(
@@ -71,28 +88,32 @@ def get_name(
         ),
     )
     if "error" in result:
-        logger.error(f'Error {result.get("error")}, expected none')
-        return name
+        return fail(
+            name,
+            on_failure,
+            classify_message(result.get("error")),
+            f'Error {result.get("error")}, expected none',
+        )
     if "total" not in result or result["total"] != 1:
-        logger.error(f'Total of {result.get("total")}, expected 1')
-        return name
+        return fail(
+            name,
+            on_failure,
+            NOT_FOUND,
+            f'Total of {result.get("total")}, expected 1',
+        )
     if "found" not in result or result["found"] != 1:
-        logger.error(f'Found of {result.get("found")}, expected 1')
-        return name
+        return fail(
+            name,
+            on_failure,
+            NOT_FOUND,
+            f'Found of {result.get("found")}, expected 1',
+        )
     if "data" not in result or result["data"] is None or len(result["data"]) != 1:
-        logger.error("No data received")
-        return name
-
-    authors = list(loads(first(result["data"])["author_info"]).values())
-    return clean_filename(
-        " - ".join(
-            [
-                "{} and {}".format(", ".join(authors[:-1]), authors[-1])
-                if len(authors) > 1
-                else authors[0],
-                first(result["data"])["title"],
-            ],
+        return fail(
+            name,
+            on_failure,
+            NOT_FOUND,
+            "No data received",
         )
-        + f" {{{first(result['data'])['id']}}}",
-    )
-    return name
+
+    return render(renderers, first(result["data"])) or name
@@ -0,0 +1,74 @@
+from math import ceil
+from more_itertools import chunked
+from loguru import logger
+from ..ratelimit import send
+
+BATCH_SIZE = 50
+PER_PAGE = 100
+
+
+def get_rows(
+    hashes,
+    endpoint,
+    api_key,
+    user_agent,
+    session,
+    rate_limit=None,
+    timeout=None,
+    batch_size=BATCH_SIZE,
+    per_page=PER_PAGE,
+):
+    # searches for many hashes per request, paging through the results and
+    # mapping each row back to its hash; hashes missing from the result are
+    # left to the per-hash lookup in get_name
+    rows = {}
+    for batch in chunked(sorted({h.lower() for h in hashes}), batch_size):
+        # a batch can't match more rows than it has hashes, so paging stops
+        # after enough pages to cover it or at the first page matching none
+        start = 0
+        for _ in range(ceil(len(batch) / per_page)):
+            get = {
+                "url": endpoint
+                / "tor"
+                / "js"
+                / "loadSearchJSONbasic.php"
+                % {
+                    "tor[hash]": " ".join(batch),
+                    "tor[startNumber]": start,
+                    "perpage": per_page,
+                },
+                "headers": {
+                    "User-Agent": user_agent,
+                },
+                "cookies": {
+                    "mam_id": api_key,
+                },
+            }
+
+            logger.trace(get)
+            try:
+                r = send(session, get, rate_limit=rate_limit, timeout=timeout)
+                assert r.headers.get("content-type").startswith(
+                    "application/json"
+                ), f'content-type was {r.headers.get("content-type")}'
+                result = r.json()
+            except Exception as err:
+                logger.warning(f"Batch lookup failed, falling back: {err}")
+                break
+            if "error" in result or not result.get("data"):
+                logger.debug(f'Batch lookup found nothing: {result.get("error")}')
+                break
+
+            matched = 0
+            for row in result["data"]:
+                hash = str(row.get("hash", "")).lower()
+                if hash in batch:
+                    rows[hash] = row
+                    matched += 1
+            if not matched:
+                break
+            start += len(result["data"])
+            if start >= int(result.get("found", 0)):
+                break
+    logger.debug(f"Batch lookup matched {len(rows)} of {len(hashes)} hashes")
+    return rows
@@ -0,0 +1,7 @@
+from .clean_many import clean_many  # noqa: F401
+from .compile_cleaner import compile_cleaner  # noqa: F401
+from .compile_template import compile_template  # noqa: F401
+from .compile_templates import compile_templates  # noqa: F401
+from .get_version import get_version  # noqa: F401
+from .load_templates import load_templates  # noqa: F401
+from .render_many import render, render_many  # noqa: F401
@@ -0,0 +1,7 @@
+def clean_many(
+    clean,
+    filenames,
+):
+    # each distinct filename is cleaned once however often it repeats
+    cleaned = {f: clean(f) for f in set(filenames)}
+    return [cleaned[f] for f in filenames]
@@ -0,0 +1,28 @@
+import unicodedata
+from functools import lru_cache
+from re import compile as re_compile
+
+CACHE_SIZE = 2**16
+
+
+def compile_cleaner(
+    whitelist,
+    replace,
+    cache_size=CACHE_SIZE,
+):
+    # the whitelist is ascii, so cleaning is a single bytes.translate
+    # deleting every other ascii character
+    delete = bytes(c for c in range(128) if chr(c) not in whitelist)
+    replace = tuple(replace)
+    spaces = re_compile(" {2,}")
+
+    @lru_cache(maxsize=cache_size)
+    def clean_filename(filename):
+        for r in replace:
+            filename = filename.replace(r, "")
+        if not filename.isascii():
+            filename = unicodedata.normalize("NFKD", filename)
+        filename = filename.encode("ascii", "ignore").translate(None, delete)
+        return spaces.sub(" ", filename.decode("ascii")).strip()
+
+    return clean_filename
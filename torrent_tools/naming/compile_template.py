@@ -0,0 +1,25 @@
+from string import Formatter
+
+
+def compile_template(
+    template,
+    fields,
+    clean,
+):
+    # parsing happens once, so rendering is a single str.format over only
+    # the fields the template refers to
+    names = []
+    for _, field, _, _ in Formatter().parse(template):
+        if field is None:
+            continue
+        if field not in fields:
+            raise ValueError(f'Unknown field "{field}" in template "{template}"')
+        if field not in names:
+            names.append(field)
+    getters = [(n, fields[n]) for n in names]
+    format = template.format
+
+    def render(record):
+        return clean(format(**{n: g(record) for n, g in getters}))
+
+    return render
@@ -0,0 +1,12 @@
+from .compile_template import compile_template
+
+
+def compile_templates(
+    templates,
+    fields,
+    clean,
+):
+    return {
+        release_type: compile_template(template, fields, clean)
+        for release_type, template in templates.items()
+    }
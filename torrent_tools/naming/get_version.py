@@ -0,0 +1,15 @@
+from hashlib import sha1
+from json import dumps
+
+
+def get_version(
+    version,
+    templates,
+    defaults,
+):
+    # customised templates get their own version, so names stored under
+    # the defaults are resolved again
+    if templates == defaults:
+        return str(version)
+    digest = sha1(dumps(templates, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{version}-{digest[:8]}"
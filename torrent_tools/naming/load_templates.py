@@ -0,0 +1,16 @@
+from json import load
+
+
+def load_templates(
+    path,
+    defaults,
+):
+    # a JSON object of {tracker: {release type: template}} overriding the
+    # defaults one release type at a time
+    templates = {t: dict(v) for t, v in defaults.items()}
+    if path is None:
+        return templates
+    with open(path, encoding="utf-8") as f:
+        for tracker, overrides in load(f).items():
+            templates.setdefault(tracker, {}).update(overrides)
+    return templates
@@ -0,0 +1,24 @@
+from loguru import logger
+
+DEFAULT = "*"
+
+
+def render(
+    renderers,
+    record,
+    release_type=None,
+):
+    renderer = renderers.get(release_type, renderers.get(DEFAULT))
+    if renderer is None:
+        logger.warning(f'Unhandled Release Type "{release_type}"')
+        return None
+    return renderer(record)
+
+
+def render_many(
+    renderers,
+    records,
+    release_type=lambda record: None,
+):
+    # unhandled release types render as None
+    return [render(renderers, r, release_type(r)) for r in records]
@@ -0,0 +1,5 @@
+from .build_plan import build_plan  # noqa: F401
+from .plan_operations import plan_operations  # noqa: F401
+from .read_plan import read_plan  # noqa: F401
+from .review_plan import review_plan  # noqa: F401
+from .write_plan import write_plan  # noqa: F401
@@ -0,0 +1,25 @@
+from os.path import splitext
+from loguru import logger
+
+
+def build_plan(
+    resolved,
+):
+    # entries with several candidates are left for review rather than
+    # prompting, so resolution never waits on a human
+    entries = []
+    for directory, candidates in resolved:
+        if splitext(directory["name"])[0] in candidates:
+            logger.info(f"{directory['name']} is a candidate, no action required")
+            continue
+
+        entries.append(
+            {
+                "name": directory["name"],
+                "torrents": directory["torrents"],
+                "candidates": candidates,
+                "choice": 1 if len(candidates) == 1 else None,
+                "action": "rename" if len(candidates) == 1 else "review",
+            }
+        )
+    return entries
@@ -0,0 +1,74 @@
+from os.path import splitext
+from loguru import logger
+
+
+def plan_operations(
+    entries,
+    files,
+):
+    operations = []
+    for entry in [e for e in entries if e["action"] == "rename"]:
+        candidate = entry["candidates"][entry["choice"] - 1]
+        renamed = []
+        for torrent in entry["torrents"]:
+            hash = torrent.hash
+            if hash not in files:
+                logger.warning(f" - No file list for {hash}, skipping")
+                continue
+            renamed.append(torrent)
+            if len(files[hash]) == 1:
+                target = "".join(
+                    [
+                        candidate,
+                        splitext(files[hash][list(files[hash].keys())[0]])[1],
+                    ],
+                )
+                logger.info(f" - Renaming {hash} to {target}")
+                operations.append(
+                    {
+                        "hash": hash,
+                        "tracker": torrent.tracker,
+                        "daemon": torrent.daemon,
+                        "method": "core.rename_files",
+                        "name": candidate,
+                        "args": [
+                            hash,
+                            [
+                                (
+                                    list(files[hash].keys())[0],
+                                    target,
+                                ),
+                            ],
+                        ],
+                    }
+                )
+            else:
+                logger.info(f" - Renaming {hash} to {candidate}")
+                operations.append(
+                    {
+                        "hash": hash,
+                        "tracker": torrent.tracker,
+                        "daemon": torrent.daemon,
+                        "method": "core.rename_folder",
+                        "name": candidate,
+                        "args": [
+                            hash,
+                            entry["name"],
+                            candidate,
+                        ],
+                    }
+                )
+
+        # torrents skipped above had nothing renamed, so nothing to recheck
+        for torrent in renamed:
+            logger.info(f" - Rechecking {torrent.hash}")
+            operations.append(
+                {
+                    "hash": torrent.hash,
+                    "tracker": torrent.tracker,
+                    "daemon": torrent.daemon,
+                    "method": "core.force_recheck",
+                    "args": [[torrent.hash]],
+                }
+            )
+    return operations
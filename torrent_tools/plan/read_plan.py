@@ -0,0 +1,16 @@
+from json import load
+
+from ..deluge import Torrent
+
+
+def read_plan(
+    path,
+):
+    with open(path) as f:
+        return [
+            {
+                **entry,
+                "torrents": [Torrent(**t) for t in entry["torrents"]],
+            }
+            for entry in load(f)
+        ]
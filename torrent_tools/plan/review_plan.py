@@ -0,0 +1,23 @@
+from click import IntRange, prompt
+from loguru import logger
+
+
+def review_plan(
+    entries,
+):
+    for entry in [e for e in entries if e["action"] == "review"]:
+        logger.info(
+            f"'{entry['name']}' ({len(entry['torrents'])} torrents) has {len(entry['candidates'])} candidate(s):"
+        )
+        for index, candidate in enumerate(entry["candidates"]):
+            logger.info(f" {index + 1}: '{candidate}'")
+
+        entry["choice"] = prompt(
+            "Select a candidate, 0 to skip",
+            type=IntRange(min=0, max=len(entry["candidates"])),
+            default=1,
+        )
+        entry["action"] = "rename" if entry["choice"] else "skip"
+        if entry["action"] == "skip":
+            logger.info(" - Skipping")
+    return entries
@@ -0,0 +1,24 @@
+from json import dump
+from loguru import logger
+
+
+def write_plan(
+    path,
+    entries,
+):
+    with open(path, "w") as f:
+        dump(
+            [
+                {
+                    **entry,
+                    "torrents": [t._asdict() for t in entry["torrents"]],
+                }
+                for entry in entries
+            ],
+            f,
+            indent=2,
+        )
+    logger.info(
+        f"Wrote {len(entries)} plan entries to {path}, "
+        f"{len([e for e in entries if e['action'] == 'review'])} awaiting review"
+    )
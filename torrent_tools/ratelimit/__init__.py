@@ -0,0 +1,4 @@
+from .parse_timeout import parse_timeout  # noqa: F401
+from .pool import pool  # noqa: F401
+from .send import send  # noqa: F401
+from .token_bucket import TokenBucket  # noqa: F401
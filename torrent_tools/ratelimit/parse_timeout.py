@@ -0,0 +1,9 @@
+def parse_timeout(
+    value,
+):
+    # "5,30" is a five second connect and thirty second read timeout, a
+    # single number is used for both
+    if value is None or isinstance(value, tuple):
+        return value
+    connect, _, read = str(value).partition(",")
+    return float(connect), float(read or connect)
@@ -0,0 +1,13 @@
+from requests.adapters import HTTPAdapter
+
+
+def pool(
+    session,
+    size,
+):
+    # one kept-alive connection per worker, rather than requests' default
+    # of ten that more workers would churn through
+    adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
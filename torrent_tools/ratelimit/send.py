@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from random import uniform
+from time import sleep
+from loguru import logger
+from requests import ConnectionError, HTTPError, Request, Timeout
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def get_retry_after(
+    response,
+):
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(
+            0.0,
+            (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(),
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def is_cached(
+    session,
+    method,
+    request,
+):
+    cache = getattr(session, "cache", None)
+    if cache is None:
+        return False
+    return cache.contains(
+        request=session.prepare_request(Request(method, **request)),
+    )
+
+
+def send(
+    session,
+    request,
+    rate_limit=None,
+    method="GET",
+    max_retries=5,
+    backoff_base=1.0,
+    backoff_cap=60.0,
+    stream=False,
+    timeout=None,
+):
+    cached = rate_limit is None or is_cached(session, method, request)
+    attempt = 0
+    while True:
+        if not cached and rate_limit is not None:
+            rate_limit.acquire()
+        try:
+            r = session.request(method, stream=stream, timeout=timeout, **request)
+            r.raise_for_status()
+            return r
+        except HTTPError as http_err:
+            if http_err.response.status_code not in RETRY_STATUSES:
+                raise
+            retry_after = get_retry_after(http_err.response)
+            err = http_err
+        except (ConnectionError, Timeout) as conn_err:
+            retry_after = None
+            err = conn_err
+
+        if attempt >= max_retries:
+            raise err
+
+        delay = (
+            retry_after
+            if retry_after is not None
+            else uniform(0, min(backoff_cap, backoff_base * 2**attempt))
+        )
+        logger.warning(
+            f"{err}, retrying in {delay:.1f} seconds ({attempt + 1}/{max_retries})"
+        )
+        if rate_limit is not None and retry_after is not None:
+            rate_limit.block(delay)
+        else:
+            sleep(delay)
+        cached = False
+        attempt += 1
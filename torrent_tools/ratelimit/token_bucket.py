@@ -0,0 +1,64 @@
+from threading import Lock
+from time import monotonic, sleep
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate,
+        per,
+        burst=1,
+    ):
+        # one token by default spaces requests per / rate apart, so no window
+        # of per seconds sees more than rate of them
+        assert rate > 0, "rate must be positive"
+        assert per > 0, "per must be positive"
+        self.rate = rate
+        self.per = per
+        self.capacity = burst
+        self.fill_rate = rate / per
+        self.tokens = float(self.capacity)
+        self.updated = monotonic()
+        self.blocked_until = 0.0
+        self.lock = Lock()
+
+    @classmethod
+    def parse(
+        cls,
+        value,
+    ):
+        # "5/10" is five requests every ten seconds
+        if isinstance(value, cls):
+            return value
+        rate, _, per = str(value).partition("/")
+        return cls(int(rate), float(per or 1))
+
+    def __str__(self):
+        return f"{self.rate}/{self.per:g}"
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated) * self.fill_rate,
+                )
+                self.updated = now
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(
+                    self.blocked_until - now,
+                    (1 - self.tokens) / self.fill_rate,
+                )
+            sleep(wait)
+
+    def block(
+        self,
+        seconds,
+    ):
+        # a server-imposed pause applies to every worker sharing the bucket
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, monotonic() + seconds)
+            self.tokens = 0.0
@@ -0,0 +1,5 @@
+from .get_json import get_json  # noqa: F401
+from .is_compliant import is_compliant  # noqa: F401
+from .resolve_candidates import resolve_candidates  # noqa: F401
+from .shard import in_shard, parse_shard  # noqa: F401
+from .stream_json import stream_json  # noqa: F401
@@ -0,0 +1,49 @@
+from loguru import logger
+
+AUTH = "auth"
+NOT_FOUND = "not-found"
+TRANSIENT = "transient"
+
+
+def classify_status(
+    status_code,
+):
+    if status_code in [401, 403]:
+        return AUTH
+    if status_code in [404, 410]:
+        return NOT_FOUND
+    return TRANSIENT
+
+
+def classify_message(
+    message,
+):
+    message = str(message).lower()
+    if any(w in message for w in ["credential", "token", "auth", "not signed in"]):
+        return AUTH
+    if any(w in message for w in ["rate limit", "try again", "timed out"]):
+        return TRANSIENT
+    return NOT_FOUND
+
+
+def fail(
+    name,
+    on_failure,
+    kind,
+    message,
+):
+    logger.error(message)
+    if on_failure is not None:
+        on_failure(kind, message)
+    return name
+
+
+class LookupFailure(Exception):
+    def __init__(
+        self,
+        kind,
+        message,
+    ):
+        super().__init__(message)
+        self.kind = kind
+        self.message = message
@@ -0,0 +1,53 @@
+from json import dumps
+from loguru import logger
+from requests import HTTPError
+from ..ratelimit import send
+from .failure import TRANSIENT, LookupFailure, classify_status
+
+
+def get_json(
+    session,
+    request,
+    rate_limit=None,
+    method="GET",
+    timeout=None,
+):
+    # sends a tracker API request and returns the decoded JSON body, with
+    # transport errors raised as classified LookupFailures
+    logger.trace(request)
+    try:
+        r = send(
+            session,
+            request,
+            rate_limit=rate_limit,
+            method=method,
+            timeout=timeout,
+        )
+        assert r.headers.get(
+            "content-type"
+        ).startswith(
+            "application/json"
+        ), f'content-type was {r.headers.get("content-type")}, expected application/json'
+        result = r.json()
+    except HTTPError as http_err:
+        raise LookupFailure(
+            classify_status(http_err.response.status_code),
+            f"HTTP error occurred: {http_err}",
+        )
+    except Exception as err:
+        raise LookupFailure(
+            TRANSIENT,
+            f"Other error occurred: {err}",
+        )
+
+    logger.trace("Received {0} bytes from API".format(len(r.content)))
+    logger.trace(
+        dumps(
+            {
+                "headers": {k: r.headers[k] for k in r.headers},
+                "body": result,
+            },
+            indent=2,
+        ),
+    )
+    return result
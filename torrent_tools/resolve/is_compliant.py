@@ -0,0 +1,16 @@
+from os.path import splitext
+
+
+def is_compliant(
+    directory,
+    store,
+    versions,
+):
+    # true when every torrent's stored candidate or last applied name is
+    # already the current name, so no tracker lookup is needed
+    names = {directory["name"], splitext(directory["name"])[0]}
+    for torrent in directory["torrents"]:
+        row = store.get(torrent.hash, torrent.tracker, versions[torrent.tracker])
+        if row is None or not names & {row["candidate"], row["applied"]}:
+            return False
+    return True
@@ -0,0 +1,123 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from loguru import logger
+
+from .shard import in_shard
+
+
+def get_candidate(
+    torrent,
+    name,
+    tracker_callbacks,
+    store=None,
+    versions=None,
+    failures=None,
+):
+    if failures is not None:
+        failure = failures.get(torrent.hash, torrent.tracker)
+        if failure is not None:
+            logger.debug(
+                f"{torrent.hash} last failed as {failure['kind']} on {torrent.tracker}, skipping"
+            )
+            return name
+    # callbacks return their name argument when a lookup fails, so passing
+    # None tells a failure apart from a torrent that is already compliant
+    candidate = tracker_callbacks[torrent.tracker](
+        hash=torrent.hash,
+        name=None,
+        on_failure=None
+        if failures is None
+        else lambda kind, message: failures.put(
+            torrent.hash,
+            torrent.tracker,
+            kind,
+            message,
+        ),
+    )
+    if candidate is None:
+        return name
+    if failures is not None:
+        failures.clear(torrent.hash, torrent.tracker)
+    if store is not None:
+        store.put_candidate(
+            torrent.hash,
+            torrent.tracker,
+            versions[torrent.tracker],
+            candidate,
+        )
+    return candidate
+
+
+def get_candidates(
+    directory,
+    tracker_callbacks,
+    store=None,
+    versions=None,
+    failures=None,
+):
+    return sorted(
+        {
+            get_candidate(
+                torrent,
+                directory["name"],
+                tracker_callbacks,
+                store=store,
+                versions=versions,
+                failures=failures,
+            )
+            # cross-seeds on several daemons are only looked up once
+            for torrent in {
+                (t.hash, t.tracker): t for t in directory["torrents"]
+            }.values()
+        },
+        key=len,
+        reverse=True,
+    )
+
+
+def resolve_candidates(
+    directories,
+    tracker_callbacks,
+    jobs=1,
+    store=None,
+    versions=None,
+    failures=None,
+    shard=None,
+    deadline=None,
+    *args,
+    **kwargs,
+):
+    # yields (directory, candidates) in input order, keeping at most
+    # jobs * 2 lookups in flight so a slow consumer doesn't queue the
+    # entire library ahead of it
+    logger.trace(f"Resolving candidates with {jobs} worker(s)")
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for directory in directories:
+            if not in_shard(directory, shard):
+                continue
+            # past the deadline lookups already started finish, but no
+            # more are begun
+            if deadline is not None and monotonic() >= deadline:
+                logger.warning("Time budget spent, not starting further lookups")
+                break
+            pending.append(
+                (
+                    directory,
+                    executor.submit(
+                        get_candidates,
+                        directory,
+                        tracker_callbacks,
+                        store=store,
+                        versions=versions,
+                        failures=failures,
+                    ),
+                )
+            )
+            if len(pending) >= jobs * 2:
+                directory, future = pending.popleft()
+                yield directory, future.result()
+        while pending:
+            directory, future = pending.popleft()
+            yield directory, future.result()
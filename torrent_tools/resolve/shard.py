@@ -0,0 +1,22 @@
+def parse_shard(
+    value,
+):
+    # "2/8" is the third of eight shards; None processes everything
+    if value is None or isinstance(value, tuple):
+        return value
+    index, _, count = str(value).partition("/")
+    index, count = int(index), int(count)
+    assert 0 <= index < count, f"shard {value} is not in 0/n..(n-1)/n"
+    return index, count
+
+
+def in_shard(
+    directory,
+    shard,
+):
+    # directories are assigned by their lowest infohash so cross-seeded
+    # siblings always land in the same shard
+    if shard is None:
+        return True
+    index, count = shard
+    return int(min(t.hash for t in directory["torrents"])[:8], 16) % count == index
@@ -0,0 +1,50 @@
+from loguru import logger
+from requests import HTTPError, RequestException
+from ..ratelimit import send
+from ..stream import MissingKey, iter_values
+from .failure import TRANSIENT, LookupFailure, classify_status
+
+
+def stream_json(
+    session,
+    request,
+    key,
+    on_missing,
+    rate_limit=None,
+    method="GET",
+    timeout=None,
+):
+    # like get_json, but yields the values stored under key as they are
+    # parsed; a body without key is passed whole to on_missing, which
+    # raises the API's error or returns to end the stream
+    logger.trace(request)
+    try:
+        r = send(
+            session,
+            request,
+            rate_limit=rate_limit,
+            method=method,
+            stream=True,
+            timeout=timeout,
+        )
+    except HTTPError as http_err:
+        raise LookupFailure(
+            classify_status(http_err.response.status_code),
+            f"HTTP error occurred: {http_err}",
+        )
+    except Exception as err:
+        raise LookupFailure(
+            TRANSIENT,
+            f"Other error occurred: {err}",
+        )
+
+    with r:
+        try:
+            yield from iter_values(r.iter_content(chunk_size=2**16), key)
+        except MissingKey as missing:
+            on_missing(missing.document)
+        except (RequestException, ValueError) as err:
+            raise LookupFailure(
+                TRANSIENT,
+                f"Invalid response: {err}",
+            )
@@ -1,13 +1,16 @@
-from requests import HTTPError, post as http_post
+from os.path import join
+from requests import Session
 from loguru import logger
 
 from click import STRING, command, option
 
-from json import dumps
-
 from yarl import URL
 
-from .. import BTN_ENDPOINT, USER_AGENT
+from .. import BTN_ENDPOINT, BTN_RATE, BTN_TIMEOUT, CONFIG, USER_AGENT
+from ..btn import index_torrents
+from ..ratelimit import TokenBucket, parse_timeout
+from ..resolve.failure import LookupFailure
+from ..store import Catalog, print_records
 
 
 @command()
@@ -23,6 +26,40 @@ from .. import BTN_ENDPOINT, USER_AGENT
     show_default=True,
     callback=lambda _1, _2, x: x if isinstance(x, URL) else URL(x),
 )
+@option(
+    "--btn-rate",
+    required=False,
+    default=BTN_RATE,
+    show_default=True,
+    callback=lambda _1, _2, x: TokenBucket.parse(x),
+)
+@option(
+    "--btn-timeout",
+    required=False,
+    default=BTN_TIMEOUT,
+    show_default=True,
+    callback=lambda _1, _2, x: parse_timeout(x),
+)
+@option(
+    "--refresh",
+    required=False,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@option(
+    "--jsonl",
+    required=False,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@option(
+    "--config",
+    required=False,
+    default=CONFIG,
+    show_default=True,
+)
 @option(
     "--user-agent",
     required=False,
@@ -32,56 +69,34 @@ from .. import BTN_ENDPOINT, USER_AGENT
 def cli(
     btn_api_key,
     btn_endpoint,
+    btn_rate,
+    btn_timeout,
+    refresh,
+    jsonl,
+    config,
     user_agent,
 ):
     assert isinstance(btn_endpoint, URL)
-
-    post = {
-        "url": btn_endpoint,
-        "json": {
-            "method": "userInfo",
-            "params": [btn_api_key],
-            "id": 1,
-        },
-        "headers": {
-            "Authorization": f"token {btn_api_key}",
-        },
-    }
-
-    logger.trace(post)
-    try:
-        r = http_post(**post)
-        r.raise_for_status()
-        assert r.headers.get(
-            "content-type"
-        ).startswith(
-            "application/json"
-        ), f'content-type was {r.headers.get("content-type")}, expected application/json'
-        result = r.json()
-    except HTTPError as http_err:
-        logger.error(f"HTTP error occurred: {http_err}")
-        return
-    except Exception as err:
-        logger.error(f"Other error occurred: {err}")
-        return
-
-    logger.debug("Received {0} bytes from API".format(len(r.content)))
-    logger.trace(
-        {
-            "headers": r.headers,
-            "body": result,
-        },
-    )
-
-    if "error" in result:
-        logger.error(f'Error {result.get("error")}, expected none')
-        return
-    if "result" not in result or result["result"] is None:
-        logger.error("No result received")
+    if not btn_api_key:
+        logger.error("No API key given for BTN")
         return
 
-    result = result["result"]
-    print(dumps(result))
+    with Catalog(join(config, "catalog.sqlite")) as catalog, Session() as session:
+        session.headers["User-Agent"] = user_agent
+        try:
+            index_torrents(
+                catalog,
+                "landof.tv",
+                btn_endpoint,
+                btn_api_key,
+                session,
+                rate_limit=btn_rate,
+                timeout=btn_timeout,
+                refresh=refresh,
+                on_record=print_records if jsonl else None,
+            )
+        except LookupFailure as failure:
+            logger.error(f"Indexing landof.tv failed: {failure.message}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,250 @@
+from json import dumps
+from os.path import join
+from loguru import logger
+
+from click import (
+    STRING,
+    Choice,
+    File,
+    IntRange,
+    argument,
+    group,
+    option,
+    pass_context,
+)
+
+from yarl import URL
+
+from .. import (
+    CACHE_BACKEND,
+    CACHE_EXPIRE,
+    CACHE_MAX_ENTRIES,
+    CACHE_MAX_SIZE,
+    CACHE_TTLS,
+    CONFIG,
+    MAM_ENDPOINT,
+    ORPHEUS_ENDPOINT,
+    ORPHEUS_RATE,
+    ORPHEUS_TIMEOUT,
+    REDACTED_ENDPOINT,
+    REDACTED_RATE,
+    REDACTED_TIMEOUT,
+    USER_AGENT,
+)
+from ..cache import get_stats, open_cache, prune_cache
+from ..gazelle import GroupCache, get_group
+from ..ratelimit import TokenBucket, parse_timeout
+from ..resolve.failure import LookupFailure
+from ..store import Catalog
+
+
+@group()
+@option(
+    "--config",
+    required=False,
+    default=CONFIG,
+    show_default=True,
+)
+@option(
+    "--cache-backend",
+    required=False,
+    default=CACHE_BACKEND,
+    show_default=True,
+    type=Choice(["sqlite", "filesystem"]),
+)
+@option(
+    "--orpheus-endpoint",
+    required=False,
+    default=ORPHEUS_ENDPOINT,
+    show_default=True,
+    callback=lambda _1, _2, x: x if isinstance(x, URL) else URL(x),
+)
+@option(
+    "--redacted-endpoint",
+    required=False,
+    default=REDACTED_ENDPOINT,
+    show_default=True,
+    callback=lambda _1, _2, x: x if isinstance(x, URL) else URL(x),
+)
+@option(
+    "--mam-endpoint",
+    required=False,
+    default=MAM_ENDPOINT,
+    show_default=True,
+    callback=lambda _1, _2, x: x if isinstance(x, URL) else URL(x),
+)
+@pass_context
+def cli(
+    ctx,
+    config,
+    cache_backend,
+    orpheus_endpoint,
+    redacted_endpoint,
+    mam_endpoint,
+):
+    ctx.obj = {
+        "config": config,
+        "endpoints": {
+            "opsfet.ch": orpheus_endpoint,
+            "flacsfor.me": redacted_endpoint,
+            "myanonamouse.net": mam_endpoint,
+        },
+        "open": lambda max_entries=None, max_size=None: open_cache(
+            config,
+            cache_backend,
+            CACHE_EXPIRE,
+            urls_expire_after={
+                orpheus_endpoint.host: CACHE_TTLS["opsfet.ch"],
+                redacted_endpoint.host: CACHE_TTLS["flacsfor.me"],
+                mam_endpoint.host: CACHE_TTLS["myanonamouse.net"],
+            },
+            max_entries=max_entries,
+            max_size=max_size,
+        ),
+    }
+
+
+@cli.command()
+@pass_context
+def stats(
+    ctx,
+):
+    with ctx.obj["open"]() as session:
+        print(dumps(get_stats(session)))
+
+
+@cli.command()
+@option(
+    "--max-entries",
+    required=False,
+    default=CACHE_MAX_ENTRIES,
+    show_default=True,
+    type=IntRange(min=1),
+)
+@option(
+    "--max-size",
+    required=False,
+    default=CACHE_MAX_SIZE,
+    show_default=True,
+    type=IntRange(min=1),
+)
+@pass_context
+def prune(
+    ctx,
+    max_entries,
+    max_size,
+):
+    with ctx.obj["open"]() as session:
+        before = get_stats(session)
+        prune_cache(session, max_entries=max_entries, max_size=max_size, vacuum=True)
+        after = get_stats(session)
+    logger.info(
+        f"Pruned {before['entries'] - after['entries']} responses, "
+        f"{before['size'] - after['size']} bytes"
+    )
+    print(dumps(after))
+
+
+@cli.command()
+@argument(
+    "hashes",
+    type=File("r"),
+    default="-",
+)
+@option(
+    "--orpheus-api-key",
+    envvar="ORPHEUS_API_KEY",
+    type=STRING,
+)
+@option(
+    "--orpheus-rate",
+    required=False,
+    default=ORPHEUS_RATE,
+    show_default=True,
+    callback=lambda _1, _2, x: TokenBucket.parse(x),
+)
+@option(
+    "--orpheus-timeout",
+    required=False,
+    default=ORPHEUS_TIMEOUT,
+    show_default=True,
+    callback=lambda _1, _2, x: parse_timeout(x),
+)
+@option(
+    "--redacted-api-key",
+    envvar="REDACTED_API_KEY",
+    type=STRING,
+)
+@option(
+    "--redacted-rate",
+    required=False,
+    default=REDACTED_RATE,
+    show_default=True,
+    callback=lambda _1, _2, x: TokenBucket.parse(x),
+)
+@option(
+    "--redacted-timeout",
+    required=False,
+    default=REDACTED_TIMEOUT,
+    show_default=True,
+    callback=lambda _1, _2, x: parse_timeout(x),
+)
+@option(
+    "--user-agent",
+    required=False,
+    default=USER_AGENT,
+    show_default=True,
+)
+@pass_context
+def warm(
+    ctx,
+    hashes,
+    orpheus_api_key,
+    orpheus_rate,
+    orpheus_timeout,
+    redacted_api_key,
+    redacted_rate,
+    redacted_timeout,
+    user_agent,
+):
+    # reads "tracker hash" lines and makes the lookups deluge-rename would,
+    # filling the response cache and the catalog ahead of a run; MAM is
+    # looked up in per-run batches, so there is nothing stable to warm
+    trackers = {
+        tracker: (api_key, rate, timeout)
+        for tracker, api_key, rate, timeout in [
+            ("opsfet.ch", orpheus_api_key, orpheus_rate, orpheus_timeout),
+            ("flacsfor.me", redacted_api_key, redacted_rate, redacted_timeout),
+        ]
+        if api_key
+    }
+    with Catalog(join(ctx.obj["config"], "catalog.sqlite")) as catalog, ctx.obj[
+        "open"
+    ]() as session:
+        groups = {t: GroupCache(catalog, t) for t in trackers}
+        warmed = 0
+        for line in hashes:
+            tracker, _, hash = line.strip().partition(" ")
+            if tracker not in trackers:
+                logger.warning(f"Not warming {hash.strip()} on {tracker}")
+                continue
+            api_key, rate, timeout = trackers[tracker]
+            try:
+                get_group(
+                    hash.strip(),
+                    ctx.obj["endpoints"][tracker],
+                    api_key,
+                    user_agent,
+                    session,
+                    rate_limit=rate,
+                    timeout=timeout,
+                    groups=groups[tracker],
+                )
+                warmed += 1
+            except LookupFailure as failure:
+                logger.error(failure.message)
+        logger.info(f"Warmed {warmed} hashes")
+
+
+if __name__ == "__main__":
+    cli()
@@ -1,24 +1,86 @@
-from os.path import splitext
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from os.path import join
+from threading import Lock
+from time import monotonic
 from re import compile as re_compile, Pattern
-from click import STRING, command, option, INT, prompt, IntRange
+from click import STRING, Choice, command, option, INT, DateTime, IntRange, Path
 from .. import (
+    CACHE_BACKEND,
+    CACHE_EXPIRE,
+    CACHE_MAX_ENTRIES,
+    CACHE_MAX_SIZE,
+    CACHE_TTLS,
     CONFIG,
     DELUGE_PORT,
     DELUGE_USERNAME,
+    FAILURE_TTLS,
     FILTER,
+    DEBOUNCE,
+    JOBS,
+    RECONCILE,
+    RECHECK_BYTES,
+    RECHECKS_PER_PATH,
+    RPC_JOBS,
+    RPC_TIMEOUT,
     ORPHEUS_ENDPOINT,
+    ORPHEUS_RATE,
+    ORPHEUS_TIMEOUT,
     REDACTED_ENDPOINT,
+    REDACTED_RATE,
+    REDACTED_TIMEOUT,
     MAM_ENDPOINT,
+    MAM_RATE,
+    MAM_TIMEOUT,
+    NAMING_RULES_VERSIONS,
+    NAMING_TEMPLATES,
     USER_AGENT,
     RELEASE_TYPE_NAMES,
+    VERIFY_SAMPLE,
 )
-from ..gazelle import get_name as gazelle_get_name
-from ..mam import get_name as mam_get_name
+from ..cache import open_cache
+from ..deluge import (
+    PipelinedDelugeClient,
+    apply_operations,
+    get_files,
+    get_torrents,
+    group_torrents,
+    read_state,
+    schedule_rechecks,
+    watch_torrents,
+)
+from ..gazelle import (
+    FIELDS as GAZELLE_FIELDS,
+    GroupCache,
+    clean_filename as gazelle_clean_filename,
+    get_name as gazelle_get_name,
+)
+from ..mam import (
+    FIELDS as MAM_FIELDS,
+    clean_filename as mam_clean_filename,
+    get_name as mam_get_name,
+    get_rows as mam_get_rows,
+)
+from ..naming import compile_templates, get_version, load_templates
+from ..plan import build_plan, plan_operations, read_plan, review_plan, write_plan
+from ..ratelimit import TokenBucket, parse_timeout, pool
+from ..resolve import in_shard, is_compliant, parse_shard, resolve_candidates
+from ..store import (
+    APPLIED,
+    FAILED,
+    Catalog,
+    PLANNED,
+    RECHECKED,
+    VERIFIED,
+    FailureStore,
+    Journal,
+    NameStore,
+)
+from ..verify import verify_renames
 from yarl import URL
 from loguru import logger
 from tqdm import tqdm
-from requests_cache import CachedSession
-from datetime import timedelta
 from deluge_client import DelugeRPCClient
 
 
@@ -36,6 +98,20 @@ from deluge_client import DelugeRPCClient
     show_default=True,
     callback=lambda _1, _2, x: x if isinstance(x, URL) else URL(x),
 )
+@option(
+    "--orpheus-rate",
+    required=False,
+    default=ORPHEUS_RATE,
+    show_default=True,
+    callback=lambda _1, _2, x: TokenBucket.parse(x),
+)
+@option(
+    "--orpheus-timeout",
+    required=False,
+    default=ORPHEUS_TIMEOUT,
+    show_default=True,
+    callback=lambda _1, _2, x: parse_timeout(x),
+)
 @option(
     "--redacted-api-key",
     required=True,
@@ -49,6 +125,20 @@ from deluge_client import DelugeRPCClient
     show_default=True,
     callback=lambda _1, _2, x: x if isinstance(x, URL) else URL(x),
 )
+@option(
+    "--redacted-rate",
+    required=False,
+    default=REDACTED_RATE,
+    show_default=True,
+    callback=lambda _1, _2, x: TokenBucket.parse(x),
+)
+@option(
+    "--redacted-timeout",
+    required=False,
+    default=REDACTED_TIMEOUT,
+    show_default=True,
+    callback=lambda _1, _2, x: parse_timeout(x),
+)
 @option(
     "--mam-api-key",
     required=True,
@@ -62,10 +152,25 @@ from deluge_client import DelugeRPCClient
     show_default=True,
     callback=lambda _1, _2, x: x if isinstance(x, URL) else URL(x),
 )
+@option(
+    "--mam-rate",
+    required=False,
+    default=MAM_RATE,
+    show_default=True,
+    callback=lambda _1, _2, x: TokenBucket.parse(x),
+)
+@option(
+    "--mam-timeout",
+    required=False,
+    default=MAM_TIMEOUT,
+    show_default=True,
+    callback=lambda _1, _2, x: parse_timeout(x),
+)
 @option(
     "--deluge-host",
     required=True,
     envvar="DELUGE_HOST",
+    multiple=True,
 )
 @option(
     "--deluge-port",
@@ -112,12 +217,64 @@ from deluge_client import DelugeRPCClient
     show_default=True,
     callback=lambda _1, _2, x: x if isinstance(x, Pattern) else re_compile(x),
 )
+@option(
+    "--deluge-state",
+    required=False,
+    type=Path(exists=True, file_okay=False),
+)
+@option(
+    "--state",
+    required=False,
+    multiple=True,
+)
+@option(
+    "--added-since",
+    required=False,
+    type=DateTime(),
+)
+@option(
+    "--min-size",
+    required=False,
+    type=IntRange(min=0),
+)
+@option(
+    "--max-size",
+    required=False,
+    type=IntRange(min=0),
+)
 @option(
     "--config",
     required=False,
     default=CONFIG,
     show_default=True,
 )
+@option(
+    "--cache-backend",
+    required=False,
+    default=CACHE_BACKEND,
+    show_default=True,
+    type=Choice(["sqlite", "filesystem"]),
+)
+@option(
+    "--cache-max-entries",
+    required=False,
+    default=CACHE_MAX_ENTRIES,
+    show_default=True,
+    type=IntRange(min=1),
+)
+@option(
+    "--cache-max-size",
+    required=False,
+    default=CACHE_MAX_SIZE,
+    show_default=True,
+    type=IntRange(min=1),
+)
+@option(
+    "--templates",
+    required=False,
+    type=Path(exists=True, dir_okay=False),
+    callback=lambda _1, _2, x: load_templates(x, NAMING_TEMPLATES),
+)
 @option(
     "--original",
     required=False,
@@ -125,6 +282,124 @@ from deluge_client import DelugeRPCClient
     show_default=True,
     is_flag=True,
 )
+@option(
+    "--plan",
+    required=False,
+    type=Path(dir_okay=False, writable=True),
+)
+@option(
+    "--apply",
+    required=False,
+    type=Path(exists=True, dir_okay=False),
+)
+@option(
+    "--review",
+    required=False,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@option(
+    "--watch",
+    required=False,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@option(
+    "--debounce",
+    required=False,
+    default=DEBOUNCE,
+    show_default=True,
+    type=IntRange(min=0),
+)
+@option(
+    "--reconcile",
+    required=False,
+    default=RECONCILE,
+    show_default=True,
+    type=IntRange(min=1),
+)
+@option(
+    "--shard",
+    required=False,
+    callback=lambda _1, _2, x: parse_shard(x),
+)
+@option(
+    "--resume",
+    required=False,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@option(
+    "--offline",
+    required=False,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@option(
+    "--time-budget",
+    required=False,
+    type=IntRange(min=1),
+)
+@option(
+    "--refresh",
+    required=False,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@option(
+    "--jobs",
+    required=False,
+    default=JOBS,
+    show_default=True,
+    type=IntRange(min=1),
+)
+@option(
+    "--rpc-jobs",
+    required=False,
+    default=RPC_JOBS,
+    show_default=True,
+    type=IntRange(min=1),
+)
+@option(
+    "--rpc-timeout",
+    required=False,
+    default=RPC_TIMEOUT,
+    show_default=True,
+    type=IntRange(min=1),
+)
+@option(
+    "--verify",
+    required=False,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@option(
+    "--verify-sample",
+    required=False,
+    default=VERIFY_SAMPLE,
+    show_default=True,
+    type=IntRange(min=0),
+)
+@option(
+    "--recheck-bytes",
+    required=False,
+    default=RECHECK_BYTES,
+    show_default=True,
+    type=IntRange(min=1),
+)
+@option(
+    "--recheck-per-path",
+    required=False,
+    default=RECHECKS_PER_PATH,
+    show_default=True,
+    type=IntRange(min=0),
+)
 @option(
     "--dryrun",
     required=False,
@@ -137,207 +412,478 @@ def cli(
     deluge_port,
     deluge_username,
     deluge_password,
+    deluge_state,
     orpheus_endpoint,
     orpheus_api_key,
+    orpheus_rate,
+    orpheus_timeout,
     redacted_endpoint,
     redacted_api_key,
+    redacted_rate,
+    redacted_timeout,
     mam_endpoint,
     mam_api_key,
+    mam_rate,
+    mam_timeout,
     filter,
     label,
     tracker,
+    state,
+    added_since,
+    min_size,
+    max_size,
     config,
+    cache_backend,
+    cache_max_entries,
+    cache_max_size,
+    templates,
+    plan,
+    apply,
+    review,
+    watch,
+    debounce,
+    reconcile,
+    shard,
+    resume,
+    offline,
+    time_budget,
+    refresh,
+    jobs,
+    rpc_jobs,
+    rpc_timeout,
+    verify,
+    verify_sample,
+    recheck_bytes,
+    recheck_per_path,
     dryrun,
     **kwargs,
 ):
+    # --time-budget counts from here, or from each run in --watch mode
+    started = monotonic()
     logger.remove()
     logger.add(lambda msg: tqdm.write(msg, end=""), colorize=True)
 
-    client = DelugeRPCClient(
-        deluge_host,
-        deluge_port,
-        deluge_username,
-        deluge_password,
+    # each daemon is "host" or "host:port", defaulting to --deluge-port
+    daemons = sorted(
+        {h if ":" in h else f"{h}:{deluge_port}" for h in deluge_host},
     )
+
+    # torrents and file lists can be read from a local daemon's state
+    # directory instead of over RPC; renames and rechecks still use RPC
+    assert deluge_state is None or len(daemons) == 1, "--deluge-state needs one daemon"
+    assert deluge_state is None or not (
+        state or added_since or min_size is not None or max_size is not None
+    ), "--state, --added-since, --min-size and --max-size need RPC listing"
+    local_files = {}
+
+    def connect(daemon, client_class=PipelinedDelugeClient):
+        host, _, port = daemon.rpartition(":")
+        client = client_class(
+            host,
+            int(port),
+            deluge_username,
+            deluge_password,
+            timeout=rpc_timeout,
+        )
+        client.connect()
+        if not client.connected:
+            raise Exception()
+        return client
+
     assert isinstance(filter, Pattern), "filter is not a Pattern"
     assert isinstance(label, Pattern), "label is not a Pattern"
     assert isinstance(orpheus_endpoint, URL), "orpheus_endpoint is not a URL"
     assert isinstance(redacted_endpoint, URL), "redacted_endpoint is not a URL"
 
-    with CachedSession(
+    with NameStore(join(config, "names.sqlite")) as store, FailureStore(
+        store,
+        FAILURE_TTLS,
+    ) as failures, Journal(
+        join(
+            config,
+            "journal.jsonl" if shard is None else "journal-%d-of-%d.jsonl" % shard,
+        )
+    ) as journal, Catalog(join(config, "catalog.sqlite")) as catalog, open_cache(
         config,
-        cache_control=False,
-        expire_after=timedelta(days=2),
-        allowable_methods=[
-            "GET",
-        ],
-        backend="filesystem",
-    ) as session:
-        logger.trace(f"Using cache dir {session.cache.cache_dir}")
+        cache_backend,
+        CACHE_EXPIRE,
+        urls_expire_after={
+            orpheus_endpoint.host: CACHE_TTLS["opsfet.ch"],
+            redacted_endpoint.host: CACHE_TTLS["flacsfor.me"],
+            mam_endpoint.host: CACHE_TTLS["myanonamouse.net"],
+        },
+        max_entries=cache_max_entries,
+        max_size=cache_max_size,
+    ) as session, ExitStack() as stack:
+        logger.trace(f"Using {cache_backend} cache in {config}")
+        pool(session, jobs)
+
+        # templates are compiled once, failing fast on unknown fields
+        renderers = {
+            t: compile_templates(templates[t], GAZELLE_FIELDS, gazelle_clean_filename)
+            for t in ["opsfet.ch", "flacsfor.me"]
+        }
+        renderers["myanonamouse.net"] = compile_templates(
+            templates["myanonamouse.net"],
+            MAM_FIELDS,
+            mam_clean_filename,
+        )
 
+        # names resolve from what ops-index catalogued first, and with
+        # --offline from nothing else
+        # filled by a batch lookup before each resolve
+        mam_rows = {}
+        orpheus_groups = GroupCache(catalog, "opsfet.ch")
+        redacted_groups = GroupCache(catalog, "flacsfor.me")
         tracker_callbacks = {
-            "opsfet.ch": lambda hash, name: gazelle_get_name(
+            "opsfet.ch": lambda hash, name, on_failure=None: gazelle_get_name(
                 hash=hash,
                 name=name,
                 api_key=orpheus_api_key,
                 endpoint=orpheus_endpoint,
                 session=session,
+                on_failure=on_failure,
+                rate_limit=orpheus_rate,
+                timeout=orpheus_timeout,
+                groups=orpheus_groups,
                 release_type_names=RELEASE_TYPE_NAMES["opsfet.ch"],
+                renderers=renderers["opsfet.ch"],
+                offline=offline,
                 **kwargs,
             ),
-            "flacsfor.me": lambda hash, name: gazelle_get_name(
+            "flacsfor.me": lambda hash, name, on_failure=None: gazelle_get_name(
                 hash=hash,
                 name=name,
                 api_key=redacted_api_key,
                 endpoint=redacted_endpoint,
                 session=session,
+                on_failure=on_failure,
+                rate_limit=redacted_rate,
+                timeout=redacted_timeout,
+                groups=redacted_groups,
                 release_type_names=RELEASE_TYPE_NAMES["flacsfor.me"],
+                renderers=renderers["flacsfor.me"],
+                offline=offline,
                 **kwargs,
             ),
-            "myanonamouse.net": lambda hash, name: mam_get_name(
+            "myanonamouse.net": lambda hash, name, on_failure=None: mam_get_name(
                 hash=hash,
                 name=name,
                 api_key=mam_api_key,
                 endpoint=mam_endpoint,
                 session=session,
+                on_failure=on_failure,
+                rate_limit=mam_rate,
+                timeout=mam_timeout,
                 release_type_names=RELEASE_TYPE_NAMES["myanonamouse.net"],
+                renderers=renderers["myanonamouse.net"],
+                offline=offline,
+                rows=mam_rows,
                 **kwargs,
             ),
         }
 
-        client.connect()
-        if not client.connected:
-            raise Exception()
+        versions = {
+            t: get_version(
+                NAMING_RULES_VERSIONS[t],
+                templates[t],
+                NAMING_TEMPLATES[t],
+            )
+            + ("-original" if kwargs.get("original") else "")
+            for t in tracker_callbacks
+        }
 
-        torrent_status = [
-            a
-            for a in client.call(
-                "core.get_torrents_status",
-                {},
-                [
-                    "hash",
-                    "name",
-                    "tracker_host",
-                    "label",
-                ],
-            ).values()
-            if filter.match(a[b"name"].decode("utf-8"))
-            and label.match(a[b"label"].decode("utf-8"))
-            and tracker.match(a[b"tracker_host"].decode("utf-8"))
-        ]
-
-        for directory in tqdm(
-            [
-                {
-                    "name": b,
-                    "torrents": {
-                        a[b"tracker_host"].decode("utf-8"): {
-                            "hash": a[b"hash"].decode("utf-8"),
-                            "label": a[b"label"].decode("utf-8"),
-                        }
-                        for a in torrent_status
-                        if a[b"name"].decode("utf-8") == b
-                    },
-                }
-                for b in sorted(
-                    {c[b"name"].decode("utf-8") for c in torrent_status},
+        with ThreadPoolExecutor(max_workers=len(daemons)) as executor:
+            clients = dict(zip(daemons, executor.map(connect, daemons)))
+        # disconnected when the run ends, however it ends
+        for client in clients.values():
+            stack.callback(client.disconnect)
+
+        def deadline(started):
+            return None if time_budget is None else started + time_budget
+
+        def past(started):
+            return time_budget is not None and monotonic() >= deadline(started)
+
+        def resolve(torrents, started):
+            directories = []
+            for directory in group_torrents(torrents):
+                unsupported = sorted(
+                    {
+                        t.tracker
+                        for t in directory["torrents"]
+                        if t.tracker not in tracker_callbacks
+                    }
                 )
-            ],
-            leave=False,
-        ):
-            if [t for t in directory["torrents"] if t not in tracker_callbacks]:
-                for tracker in [
-                    t for t in directory["torrents"] if t not in tracker_callbacks
-                ]:
-                    logger.error(
-                        f"Unsupported tracker {tracker}, skipping {directory['name']}"
+                if unsupported:
+                    for t in unsupported:
+                        logger.error(
+                            f"Unsupported tracker {t}, skipping {directory['name']}"
+                        )
+                    continue
+                if not in_shard(directory, shard):
+                    continue
+                if not refresh and is_compliant(directory, store, versions):
+                    logger.debug(
+                        f"{directory['name']} is stored as compliant, skipping"
                     )
-                continue
+                    continue
+                directories.append(directory)
 
-            candidates = sorted(
-                {
-                    tracker_callbacks[tracker](
-                        hash=directory["torrents"][tracker]["hash"],
-                        name=directory["name"],
+            # MAM allows few requests, so its hashes are looked up in batches
+            # up front and only the misses are looked up one at a time
+            mam_hashes = {
+                t.hash
+                for d in directories
+                for t in d["torrents"]
+                if t.tracker == "myanonamouse.net"
+                and (refresh or failures.get(t.hash, t.tracker) is None)
+            }
+            mam_rows.clear()
+            if mam_hashes and not offline and not past(started):
+                mam_rows.update(
+                    mam_get_rows(
+                        mam_hashes,
+                        mam_endpoint,
+                        mam_api_key,
+                        kwargs["user_agent"],
+                        session,
+                        rate_limit=mam_rate,
+                        timeout=mam_timeout,
                     )
-                    for tracker in directory["torrents"]
-                },
-                key=len,
-                reverse=True,
-            )
-            if splitext(directory["name"])[0] in candidates:
-                logger.info(f"{directory['name']} is a candidate, no action required")
-                continue
+                )
 
-            logger.info(
-                f"'{directory['name']}' ({len(directory['torrents'])} torrents) has {len(candidates)} candidate(s):"
-            )
-            for index, candidate in enumerate(candidates):
-                logger.info(f" {index + 1}: '{candidate}'")
-
-            result = 1
-            if len(candidates) > 1:
-                result = prompt(
-                    "Select a candidate, 0 to skip",
-                    type=IntRange(min=0, max=len(candidates)),
-                    default=1,
+            return build_plan(
+                tqdm(
+                    resolve_candidates(
+                        directories,
+                        tracker_callbacks,
+                        jobs=jobs,
+                        store=store,
+                        versions=versions,
+                        failures=None if refresh or offline else failures,
+                        deadline=deadline(started),
+                    ),
+                    total=len(directories),
+                    leave=False,
                 )
+            )
+
+        def execute(entries):
+            for entry in [e for e in entries if e["action"] == "review"]:
+                logger.warning(f"{entry['name']} has not been reviewed, skipping")
 
-            if result == 0:
-                logger.info(" - Skipping")
-                continue
-
-            for hash in [
-                directory["torrents"][a]["hash"] for a in directory["torrents"]
-            ]:
-                files = {
-                    p[b"index"]: p[b"path"].decode("utf-8")
-                    for p in client.call(
-                        "core.get_torrents_status",
-                        {b"hash": hash},
-                        ["files"],
-                    )[hash.encode("utf8")][b"files"]
-                }
-                if len(files) == 1:
-                    target = "".join(
+            # a cross-seeded hash has the same files everywhere, so each
+            # file list is fetched from only one daemon
+            owners = {}
+            for entry in [e for e in entries if e["action"] == "rename"]:
+                for torrent in entry["torrents"]:
+                    if torrent.daemon not in clients:
+                        logger.warning(
+                            f"{torrent.hash} is on unknown daemon {torrent.daemon}"
+                        )
+                        continue
+                    owners.setdefault(torrent.hash, torrent.daemon)
+            files = {h: local_files[h] for h in owners if h in local_files}
+            for daemon in daemons:
+                files.update(
+                    get_files(
+                        clients[daemon],
                         [
-                            candidates[result - 1],
-                            splitext(files[list(files.keys())[0]])[1],
+                            h
+                            for h, d in owners.items()
+                            if d == daemon and h not in local_files
                         ],
                     )
-                    logger.info(f" - Renaming {hash} to {target}")
-                    if not dryrun:
-                        client.call(
-                            "core.rename_files",
-                            hash,
-                            [
-                                (
-                                    list(files.keys())[0],
-                                    target.encode("utf-8"),
-                                ),
-                            ],
-                        )
-                else:
-                    logger.info(f" - Renaming {hash} to {candidates[result - 1]}")
-                    if not dryrun:
-                        client.call(
-                            "core.rename_folder",
-                            hash,
-                            directory["name"],
-                            candidates[result - 1],
-                        )
+                )
 
-            for hash in [
-                directory["torrents"][a]["hash"] for a in directory["torrents"]
-            ]:
-                logger.info(f" - Rechecking {hash}")
-                if not dryrun:
-                    client.call(
-                        "core.force_recheck",
-                        [
-                            hash,
-                        ],
+            operations = [
+                o for o in plan_operations(entries, files) if o["daemon"] in clients
+            ]
+
+            if dryrun:
+                return
+
+            journal.append(PLANNED, operations)
+            finish(operations)
+
+        def finish(operations):
+            # rechecks are scheduled separately so they do not all hit the
+            # disks at once
+            results = apply_all(
+                [o for o in operations if o["method"] != "core.force_recheck"]
+            )
+            journal.append(APPLIED, [o for o, err in results if err is None])
+            journal.append(FAILED, [o for o, err in results if err is not None])
+            for operation, err in results:
+                if err is None:
+                    store.put_applied(
+                        operation["hash"],
+                        operation["tracker"],
+                        versions[operation["tracker"]],
+                        operation["name"],
+                    )
+
+            failed = {(o["daemon"], o["hash"]) for o, err in results if err}
+            rechecks = {
+                daemon: [
+                    o
+                    for o in operations
+                    if o["method"] == "core.force_recheck"
+                    and o["daemon"] == daemon
+                    and (daemon, o["hash"]) not in failed
+                ]
+                for daemon in daemons
+            }
+            # with --verify, rechecks are only issued for torrents whose
+            # renamed files fail verification
+            if verify:
+                for daemon, ops in rechecks.items():
+                    failing = verify_renames(
+                        clients[daemon],
+                        sorted({o["hash"] for o in ops}),
+                        state_dir=deluge_state,
+                        sample=verify_sample,
+                    )
+                    journal.append(
+                        VERIFIED, [o for o in ops if o["hash"] not in failing]
+                    )
+                    rechecks[daemon] = [o for o in ops if o["hash"] in failing]
+
+            def recheck(daemon):
+                schedule_rechecks(
+                    clients[daemon],
+                    sorted({o["hash"] for o in rechecks[daemon]}),
+                    max_bytes=recheck_bytes,
+                    max_per_path=recheck_per_path,
+                )
+                journal.append(RECHECKED, rechecks[daemon])
+
+            with ThreadPoolExecutor(max_workers=len(daemons)) as executor:
+                list(executor.map(recheck, daemons))
+
+        def apply_all(operations):
+            with ThreadPoolExecutor(max_workers=len(daemons)) as executor:
+                return [
+                    result
+                    for results in executor.map(
+                        lambda daemon: apply_operations(
+                            clients[daemon],
+                            [o for o in operations if o["daemon"] == daemon],
+                            jobs=rpc_jobs,
+                        ),
+                        daemons,
+                    )
+                    for result in results
+                ]
+
+        def list_torrents(hashes=None, source=None):
+            if deluge_state is not None:
+                torrents, files = read_state(deluge_state, daemon=daemons[0])
+                local_files.update(files)
+                torrents = [
+                    t
+                    for t in torrents
+                    if filter.match(t.name)
+                    and label.match(t.label)
+                    and tracker.match(t.tracker)
+                ]
+                if hashes is None:
+                    return torrents
+                names = {t.name for t in torrents if t.hash in hashes}
+                return [t for t in torrents if t.name in names]
+
+            filters = {
+                "name": filter,
+                "label": label,
+                "tracker": tracker,
+                "state": state,
+                "added_since": added_since,
+                "min_size": min_size,
+                "max_size": max_size,
+            }
+            with ThreadPoolExecutor(max_workers=len(daemons)) as executor:
+                torrents = [
+                    t
+                    for listing in executor.map(
+                        lambda daemon: get_torrents(
+                            clients[daemon],
+                            hashes=hashes,
+                            daemon=daemon,
+                            **filters,
+                        ),
+                        daemons if source is None else [source],
                     )
+                    for t in listing
+                ]
+                if (hashes is None and source is None) or not torrents:
+                    return torrents
+                # pick up torrents on any daemon already sharing a name with
+                # the new ones, or with those on the one daemon listed
+                names = {t.name for t in torrents}
+                return [
+                    t
+                    for listing in executor.map(
+                        lambda daemon: get_torrents(
+                            clients[daemon],
+                            names=names,
+                            daemon=daemon,
+                            **filters,
+                        ),
+                        daemons,
+                    )
+                    for t in listing
+                ]
+
+        if resume:
+            pending = journal.pending()
+            for operation in [o for o in pending if o["daemon"] not in clients]:
+                logger.warning(
+                    f"{operation['hash']} is on unknown daemon "
+                    f"{operation['daemon']}, not resuming"
+                )
+            logger.info(f"Resuming {len(pending)} unfinished operation(s)")
+            if not dryrun:
+                finish([o for o in pending if o["daemon"] in clients])
+
+        if watch:
+            # one watcher per daemon, with runs serialised so they share the
+            # stores, caches and rate limits without interleaving prompts;
+            # each watcher's sweeps only list its own daemon, so N daemons
+            # don't mean N sweeps of the whole fleet
+            lock = Lock()
+
+            def run(daemon, hashes):
+                with lock:
+                    execute(resolve(list_torrents(hashes, source=daemon), monotonic()))
+
+            with ThreadPoolExecutor(max_workers=len(daemons)) as executor:
+                list(
+                    executor.map(
+                        lambda daemon: watch_torrents(
+                            partial(connect, daemon, DelugeRPCClient),
+                            partial(run, daemon),
+                            debounce=debounce,
+                            reconcile=reconcile,
+                        ),
+                        daemons,
+                    )
+                )
+            return
+
+        if apply is None:
+            entries = resolve(list_torrents(), started)
+        else:
+            entries = read_plan(apply)
+
+        if review or (plan is None and apply is None):
+            review_plan(entries)
+
+        if plan is not None:
+            write_plan(plan, entries)
+            return
+
+        execute(entries)
 
 
 if __name__ == "__main__":
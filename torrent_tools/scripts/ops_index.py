@@ -1,13 +1,26 @@
-from requests import HTTPError, get as http_get
+from os.path import join
+from requests import Session
 from loguru import logger
 
-from click import STRING, command, option
-
-from json import dumps
+from click import STRING, Choice, command, option
 
 from yarl import URL
 
-from .. import ORPHEUS_ENDPOINT, USER_AGENT
+from .. import (
+    CONFIG,
+    INDEX_TYPES,
+    ORPHEUS_ENDPOINT,
+    ORPHEUS_RATE,
+    ORPHEUS_TIMEOUT,
+    REDACTED_ENDPOINT,
+    REDACTED_RATE,
+    REDACTED_TIMEOUT,
+    USER_AGENT,
+)
+from ..gazelle import index_torrents
+from ..ratelimit import TokenBucket, parse_timeout
+from ..resolve.failure import LookupFailure
+from ..store import Catalog, print_records
 
 
 @command()
@@ -23,6 +36,75 @@ from .. import ORPHEUS_ENDPOINT, USER_AGENT
     show_default=True,
     callback=lambda _1, _2, x: x if isinstance(x, URL) else URL(x),
 )
+@option(
+    "--orpheus-rate",
+    required=False,
+    default=ORPHEUS_RATE,
+    show_default=True,
+    callback=lambda _1, _2, x: TokenBucket.parse(x),
+)
+@option(
+    "--orpheus-timeout",
+    required=False,
+    default=ORPHEUS_TIMEOUT,
+    show_default=True,
+    callback=lambda _1, _2, x: parse_timeout(x),
+)
+@option(
+    "--redacted-api-key",
+    envvar="REDACTED_API_KEY",
+    type=STRING,
+)
+@option(
+    "--redacted-endpoint",
+    required=False,
+    default=REDACTED_ENDPOINT,
+    show_default=True,
+    callback=lambda _1, _2, x: x if isinstance(x, URL) else URL(x),
+)
+@option(
+    "--redacted-rate",
+    required=False,
+    default=REDACTED_RATE,
+    show_default=True,
+    callback=lambda _1, _2, x: TokenBucket.parse(x),
+)
+@option(
+    "--redacted-timeout",
+    required=False,
+    default=REDACTED_TIMEOUT,
+    show_default=True,
+    callback=lambda _1, _2, x: parse_timeout(x),
+)
+@option(
+    "--type",
+    "types",
+    required=False,
+    default=INDEX_TYPES,
+    show_default=True,
+    multiple=True,
+    type=Choice(["seeding", "snatched", "leeching", "uploaded"]),
+)
+@option(
+    "--refresh",
+    required=False,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@option(
+    "--jsonl",
+    required=False,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@option(
+    "--config",
+    required=False,
+    default=CONFIG,
+    show_default=True,
+)
 @option(
     "--user-agent",
     required=False,
@@ -32,59 +114,64 @@ from .. import ORPHEUS_ENDPOINT, USER_AGENT
 def cli(
     orpheus_api_key,
     orpheus_endpoint,
+    orpheus_rate,
+    orpheus_timeout,
+    redacted_api_key,
+    redacted_endpoint,
+    redacted_rate,
+    redacted_timeout,
+    types,
+    refresh,
+    jsonl,
+    config,
     user_agent,
 ):
     assert isinstance(orpheus_endpoint, URL)
+    assert isinstance(redacted_endpoint, URL)
 
-    get = {
-        "url": orpheus_endpoint
-        / "ajax.php"
-        % {
-            "action": "index",
-        },
-        "headers": {
-            "User-Agent": user_agent,
-            "Authorization": f"token {orpheus_api_key}",
-        },
-    }
-
-    logger.trace(get)
-    try:
-        r = http_get(**get)
-        r.raise_for_status()
-        assert r.headers.get(
-            "content-type"
-        ).startswith(
-            "application/json"
-        ), f'content-type was {r.headers.get("content-type")}, expected application/json'
-        result = r.json()
-    except HTTPError as http_err:
-        logger.error(f"HTTP error occurred: {http_err}")
-        return
-    except Exception as err:
-        logger.error(f"Other error occurred: {err}")
-        return
-
-    logger.debug("Received {0} bytes from API".format(len(r.content)))
-    logger.trace(
-        {
-            "headers": r.headers,
-            "body": result,
-        },
-    )
-
-    if "error" in result:
-        logger.error(f'Error {result.get("error")}, expected none')
-        return
-    if "status" not in result or result["status"] != "success":
-        logger.error(f'Status of {result.get("status")}, expected success')
-        return
-    if "response" not in result or result["response"] is None:
-        logger.error("No response received")
+    trackers = [
+        (tracker, endpoint, api_key, rate, timeout)
+        for tracker, endpoint, api_key, rate, timeout in [
+            (
+                "opsfet.ch",
+                orpheus_endpoint,
+                # Orpheus keeps the "token <key>" header ops-index always sent
+                orpheus_api_key and f"token {orpheus_api_key}",
+                orpheus_rate,
+                orpheus_timeout,
+            ),
+            (
+                "flacsfor.me",
+                redacted_endpoint,
+                redacted_api_key,
+                redacted_rate,
+                redacted_timeout,
+            ),
+        ]
+        if api_key
+    ]
+    if not trackers:
+        logger.error("No API key given for Orpheus or Redacted")
         return
 
-    result = result["response"]
-    print(dumps(result))
+    with Catalog(join(config, "catalog.sqlite")) as catalog, Session() as session:
+        for tracker, endpoint, api_key, rate, timeout in trackers:
+            try:
+                index_torrents(
+                    catalog,
+                    tracker,
+                    endpoint,
+                    api_key,
+                    user_agent,
+                    session,
+                    types,
+                    rate_limit=rate,
+                    timeout=timeout,
+                    refresh=refresh,
+                    on_record=print_records if jsonl else None,
+                )
+            except LookupFailure as failure:
+                logger.error(f"Indexing {tracker} failed: {failure.message}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,12 @@
+from .catalog import Catalog  # noqa: F401
+from .failure_store import FailureStore  # noqa: F401
+from .journal import (  # noqa: F401
+    APPLIED,
+    FAILED,
+    PLANNED,
+    RECHECKED,
+    VERIFIED,
+    Journal,
+)
+from .name_store import NameStore  # noqa: F401
+from .print_records import print_records  # noqa: F401
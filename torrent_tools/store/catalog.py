@@ -0,0 +1,130 @@
+from json import dumps, loads
+from time import time
+
+from .sqlite_store import SQLiteStore
+
+
+class Catalog(SQLiteStore):
+    def __init__(
+        self,
+        path,
+    ):
+        super().__init__(
+            path,
+            """
+            CREATE TABLE IF NOT EXISTS groups (
+                tracker TEXT NOT NULL,
+                id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (tracker, id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS torrents (
+                tracker TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                id TEXT NOT NULL,
+                group_id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (tracker, hash)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS torrents_id ON torrents (tracker, id)",
+            """
+            CREATE TABLE IF NOT EXISTS syncs (
+                tracker TEXT NOT NULL,
+                list TEXT NOT NULL,
+                synced REAL NOT NULL,
+                PRIMARY KEY (tracker, list)
+            )
+            """,
+        )
+
+    def get(
+        self,
+        tracker,
+        hash,
+    ):
+        with self.lock:
+            row = self.db.execute(
+                """
+                SELECT groups.data AS "group", torrents.data AS torrent
+                FROM torrents JOIN groups
+                ON groups.tracker = torrents.tracker AND groups.id = torrents.group_id
+                WHERE torrents.tracker = ? AND torrents.hash = ?
+                """,
+                (tracker, hash.lower()),
+            ).fetchone()
+        if row is None:
+            return None
+        return loads(row["group"]), loads(row["torrent"])
+
+    def add(
+        self,
+        tracker,
+        group,
+        torrents,
+        hash_key="infoHash",
+        id_key="id",
+    ):
+        # torrents without a hash can't be matched to Deluge and are skipped
+        now = time()
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO groups VALUES (?, ?, ?, ?)",
+                (tracker, str(group["id"]), dumps(group), now),
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO torrents VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        tracker,
+                        t[hash_key].lower(),
+                        str(t[id_key]),
+                        str(group["id"]),
+                        dumps(t),
+                        now,
+                    )
+                    for t in torrents
+                    if t.get(hash_key)
+                ],
+            )
+
+    def has_torrent(
+        self,
+        tracker,
+        id,
+    ):
+        with self.lock:
+            return (
+                self.db.execute(
+                    "SELECT 1 FROM torrents WHERE tracker = ? AND id = ?",
+                    (tracker, str(id)),
+                ).fetchone()
+                is not None
+            )
+
+    def get_synced(
+        self,
+        tracker,
+        list,
+    ):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT synced FROM syncs WHERE tracker = ? AND list = ?",
+                (tracker, list),
+            ).fetchone()
+        return None if row is None else row["synced"]
+
+    def put_synced(
+        self,
+        tracker,
+        list,
+    ):
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO syncs VALUES (?, ?, ?)",
+                (tracker, list, time()),
+            )
@@ -0,0 +1,74 @@
+from time import time
+
+from .sqlite_store import SQLiteStore
+
+
+class FailureStore(SQLiteStore):
+    def __init__(
+        self,
+        path,
+        ttls,
+    ):
+        self.ttls = ttls
+        super().__init__(
+            path,
+            """
+            CREATE TABLE IF NOT EXISTS failures (
+                hash TEXT NOT NULL,
+                tracker TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                message TEXT,
+                failed REAL NOT NULL,
+                expires REAL NOT NULL,
+                PRIMARY KEY (hash, tracker)
+            )
+            """,
+        )
+
+    def get(
+        self,
+        hash,
+        tracker,
+    ):
+        # expired failures are ignored so the lookup is retried
+        with self.lock:
+            return self.db.execute(
+                "SELECT * FROM failures WHERE hash = ? AND tracker = ? AND expires > ?",
+                (hash, tracker, time()),
+            ).fetchone()
+
+    def put(
+        self,
+        hash,
+        tracker,
+        kind,
+        message,
+    ):
+        now = time()
+        with self.lock, self.db:
+            self.db.execute(
+                """
+                INSERT OR REPLACE INTO failures
+                    (hash, tracker, kind, message, failed, expires)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    hash,
+                    tracker,
+                    kind,
+                    str(message),
+                    now,
+                    now + self.ttls[kind].total_seconds(),
+                ),
+            )
+
+    def clear(
+        self,
+        hash,
+        tracker,
+    ):
+        with self.lock, self.db:
+            self.db.execute(
+                "DELETE FROM failures WHERE hash = ? AND tracker = ?",
+                (hash, tracker),
+            )
@@ -0,0 +1,106 @@
+from json import dumps, loads
+from os import fsync, makedirs
+from os.path import dirname, exists
+from threading import Lock
+from time import time
+
+from loguru import logger
+
+PLANNED = "planned"
+APPLIED = "applied"
+FAILED = "failed"
+VERIFIED = "verified"
+RECHECKED = "rechecked"
+
+
+class Journal:
+    def __init__(
+        self,
+        path,
+    ):
+        makedirs(dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.lock = Lock()
+        # a journal with nothing left to finish is started afresh so it only
+        # ever holds the most recent unfinished work
+        pending = self.pending()
+        self.file = open(path, "a" if pending else "w", encoding="utf-8")
+        if pending:
+            # keeps new records off the end of a torn final line
+            self.file.write("\n")
+            logger.warning(
+                f"{path} has {len(pending)} unfinished operation(s), "
+                "use --resume to finish them"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+    def append(
+        self,
+        event,
+        operations,
+    ):
+        # every record is flushed to disk before the operation it describes
+        # is considered done, so a crash loses at most the one in progress
+        if not operations:
+            return
+        # records are serialised up front so an operation that cannot be
+        # written leaves none of the batch behind
+        records = "".join(
+            dumps(
+                {
+                    "event": event,
+                    "time": time(),
+                    "operation": operation,
+                }
+            )
+            + "\n"
+            for operation in operations
+        )
+        with self.lock:
+            self.file.write(records)
+            self.file.flush()
+            fsync(self.file.fileno())
+
+    def replay(self):
+        if not exists(self.path):
+            return []
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                # a torn final line is what a crash mid-write leaves behind
+                try:
+                    records.append(loads(line))
+                except ValueError:
+                    logger.warning(f"Ignoring truncated record in {self.path}")
+        return records
+
+    def pending(self):
+        # folds the journal into the operations still to do: planned renames
+        # that were never applied, and rechecks of applied renames that were
+        # never verified or rechecked
+        operations = {}
+        for record in self.replay():
+            operation = record["operation"]
+            key = (operation["daemon"], operation["hash"], operation["method"])
+            if record["event"] == PLANNED:
+                operations[key] = operation
+            elif record["event"] == APPLIED:
+                operations.pop(key, None)
+            elif record["event"] == FAILED:
+                operations.pop(key, None)
+                operations.pop(
+                    (operation["daemon"], operation["hash"], "core.force_recheck"),
+                    None,
+                )
+            elif record["event"] in [VERIFIED, RECHECKED]:
+                operations.pop(key, None)
+        return list(operations.values())
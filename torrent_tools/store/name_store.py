@@ -0,0 +1,76 @@
+from time import time
+
+from .sqlite_store import SQLiteStore
+
+
+class NameStore(SQLiteStore):
+    def __init__(
+        self,
+        path,
+    ):
+        super().__init__(
+            path,
+            """
+            CREATE TABLE IF NOT EXISTS names (
+                hash TEXT NOT NULL,
+                tracker TEXT NOT NULL,
+                version TEXT NOT NULL,
+                candidate TEXT,
+                applied TEXT,
+                updated REAL NOT NULL,
+                PRIMARY KEY (hash, tracker)
+            )
+            """,
+        )
+
+    def get(
+        self,
+        hash,
+        tracker,
+        version,
+    ):
+        # rows written under another rules version are treated as absent
+        with self.lock:
+            return self.db.execute(
+                "SELECT * FROM names WHERE hash = ? AND tracker = ? AND version = ?",
+                (hash, tracker, version),
+            ).fetchone()
+
+    def put_candidate(
+        self,
+        hash,
+        tracker,
+        version,
+        candidate,
+    ):
+        with self.lock, self.db:
+            self.db.execute(
+                """
+                INSERT INTO names (hash, tracker, version, candidate, updated)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (hash, tracker) DO UPDATE SET
+                    applied = CASE
+                        WHEN version = excluded.version THEN applied
+                    END,
+                    version = excluded.version,
+                    candidate = excluded.candidate,
+                    updated = excluded.updated
+                """,
+                (hash, tracker, version, candidate, time()),
+            )
+
+    def put_applied(
+        self,
+        hash,
+        tracker,
+        version,
+        applied,
+    ):
+        with self.lock, self.db:
+            self.db.execute(
+                """
+                UPDATE names SET applied = ?, updated = ?
+                WHERE hash = ? AND tracker = ? AND version = ?
+                """,
+                (applied, time(), hash, tracker, version),
+            )
@@ -0,0 +1,12 @@
+from json import dumps
+
+
+def print_records(
+    tracker,
+    group,
+    torrents,
+):
+    # an indexer's on_record callback for --jsonl, printing each catalogued
+    # torrent as it is stored, one JSON object per line
+    for torrent in torrents:
+        print(dumps({"tracker": tracker, "group": group, "torrent": torrent}))
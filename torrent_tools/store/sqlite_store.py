@@ -0,0 +1,40 @@
+from os import makedirs
+from os.path import dirname
+from sqlite3 import Row, connect
+from threading import Lock
+
+
+class SQLiteStore:
+    def __init__(
+        self,
+        path,
+        *schema,
+    ):
+        # path is a database file, or another store whose connection and
+        # lock are shared so one database isn't opened twice
+        self.owner = isinstance(path, str)
+        if self.owner:
+            makedirs(dirname(path) or ".", exist_ok=True)
+            self.lock = Lock()
+            # WAL and a generous busy timeout let several sharded processes
+            # share a store, and an indexer write while deluge-rename reads
+            self.db = connect(path, timeout=60, check_same_thread=False)
+            self.db.row_factory = Row
+            self.db.execute("PRAGMA journal_mode=WAL")
+        else:
+            self.lock = path.lock
+            self.db = path.db
+        with self.lock, self.db:
+            for statement in schema:
+                self.db.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self.owner:
+            with self.lock:
+                self.db.close()
@@ -0,0 +1 @@
+from .iter_values import MissingKey, iter_values  # noqa: F401
@@ -0,0 +1,98 @@
+from codecs import getincrementaldecoder
+from json import JSONDecoder, loads
+from re import compile as re_compile, escape
+
+DECODER = JSONDecoder()
+WHITESPACE = re_compile(r"\s*")
+# consumed input is dropped once this much of the buffer is behind the parser
+COMPACT = 2**16
+
+
+class MissingKey(ValueError):
+    def __init__(
+        self,
+        key,
+        document,
+    ):
+        super().__init__(f'"{key}" not found')
+        self.key = key
+        self.document = document
+
+
+def iter_values(
+    chunks,
+    key,
+):
+    # yields the elements of the first array, or the values of the first
+    # object, stored under key, decoding one element at a time so only the
+    # element being decoded is held in memory; a document without key is
+    # decoded whole and raised as MissingKey, as that is an error response
+    chunks = iter(chunks)
+    decode = getincrementaldecoder("utf-8")().decode
+    pattern = re_compile(escape(f'"{key}"') + r"\s*:\s*([\[{])")
+    buffer = ""
+    eof = False
+
+    def read():
+        nonlocal buffer, eof
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buffer += decode(b"", final=True)
+        else:
+            buffer += decode(chunk)
+
+    searched = 0
+    while True:
+        match = pattern.search(buffer, max(0, searched - len(key) - 64))
+        if match is not None:
+            break
+        if eof:
+            raise MissingKey(key, loads(buffer))
+        searched = len(buffer)
+        read()
+    closing = "]" if match.group(1) == "[" else "}"
+    pos = match.end()
+
+    def skip(pos):
+        # whitespace then the next significant character, reading on demand
+        while True:
+            pos = WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer) or eof:
+                return pos
+            read()
+
+    def value(pos):
+        # a value ending exactly at the end of the buffer may be a number
+        # cut short, so it is only trusted once more input has arrived
+        while True:
+            try:
+                item, end = DECODER.raw_decode(buffer, pos)
+                if end < len(buffer) or eof:
+                    return item, end
+            except ValueError:
+                if eof:
+                    raise
+            read()
+
+    pos = skip(pos)
+    if buffer[pos : pos + 1] == closing:
+        return
+    while True:
+        if closing == "}":
+            _, pos = value(pos)
+            pos = skip(pos)
+            if buffer[pos : pos + 1] != ":":
+                raise ValueError(f"Expected ':' at {pos}")
+            pos = skip(pos + 1)
+        item, pos = value(pos)
+        yield item
+        pos = skip(pos)
+        if buffer[pos : pos + 1] == closing:
+            return
+        if buffer[pos : pos + 1] != ",":
+            raise ValueError(f"Expected ',' or '{closing}' at {pos}")
+        pos = skip(pos + 1)
+        if pos > COMPACT:
+            buffer = buffer[pos:]
+            pos = 0
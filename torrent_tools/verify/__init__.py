@@ -0,0 +1,2 @@
+from .verify_renames import verify_renames  # noqa: F401
+from .verify_torrent import verify_torrent  # noqa: F401
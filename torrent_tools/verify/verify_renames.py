@@ -0,0 +1,77 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from os.path import join
+from time import sleep
+from loguru import logger
+
+from .verify_torrent import verify_torrent
+
+
+def get_tasks(
+    status,
+    state_dir=None,
+    sample=8,
+):
+    tasks = []
+    for hash, s in status.items():
+        hash = hash.decode("utf-8")
+        tasks.append(
+            (
+                hash,
+                s[b"save_path"].decode("utf-8"),
+                [
+                    (f[b"path"].decode("utf-8"), f[b"size"])
+                    for f in sorted(s[b"files"], key=lambda f: f[b"index"])
+                ],
+                None if state_dir is None else join(state_dir, f"{hash}.torrent"),
+                sample,
+            )
+        )
+    return tasks
+
+
+def verify_renames(
+    client,
+    hashes,
+    state_dir=None,
+    sample=8,
+    attempts=2,
+    delay=5,
+):
+    # returns the hashes that still fail after every attempt, for a full
+    # recheck; file lists are re-read on each attempt because Deluge
+    # finishes renames asynchronously, and hashes Deluge no longer knows
+    # about are dropped
+    if not hashes:
+        return []
+    failed = {hash: None for hash in hashes}
+    for attempt in range(attempts):
+        if attempt:
+            sleep(delay)
+        tasks = get_tasks(
+            client.call(
+                "core.get_torrents_status",
+                {"id": sorted(failed)},
+                ["save_path", "files"],
+            ),
+            state_dir=state_dir,
+            sample=sample,
+        )
+        # deluge-rename is running RPC and lookup threads by now, which
+        # forked workers would inherit mid-flight
+        with ProcessPoolExecutor(mp_context=get_context("spawn")) as executor:
+            futures = [executor.submit(verify_torrent, *task) for task in tasks]
+            failed = {
+                hash: reason
+                for hash, reason in [f.result() for f in futures]
+                if reason is not None
+            }
+        if not failed:
+            break
+
+    for hash, reason in failed.items():
+        logger.warning(f"{hash} failed verification: {reason}")
+    logger.info(
+        f"Verified {len(hashes) - len(failed)} of {len(hashes)} renamed torrent(s)"
+    )
+    return sorted(failed)
@@ -0,0 +1,74 @@
+from hashlib import sha1
+from mmap import ACCESS_READ, mmap
+from os.path import exists, getsize, join
+from random import sample as random_sample
+
+from ..deluge.bencode import decode
+
+PIECES_SPEC = {
+    b"info": {
+        b"piece length": None,
+        b"pieces": None,
+    },
+}
+
+
+def read_piece(
+    files,
+    offset,
+    length,
+):
+    # a piece can span several files, each slice is read through an mmap
+    data = b""
+    position = 0
+    for path, size in files:
+        if size and offset < position + size and offset + length > position:
+            start = max(offset - position, 0)
+            end = min(offset + length - position, size)
+            with open(path, "rb") as f:
+                with mmap(f.fileno(), 0, access=ACCESS_READ) as buffer:
+                    data += buffer[start:end]
+        position += size
+        if position >= offset + length:
+            break
+    return data
+
+
+def verify_torrent(
+    hash,
+    save_path,
+    files,
+    torrent_path=None,
+    sample=8,
+):
+    # returns (hash, None) when every file exists at its expected size and
+    # a random sample of pieces, plus the first and last, match the piece
+    # hashes in torrent_path; otherwise (hash, reason)
+    files = [(join(save_path, path), size) for path, size in files]
+    for path, size in files:
+        if not exists(path):
+            return hash, f"{path} is missing"
+        if getsize(path) != size:
+            return hash, f"{path} is {getsize(path)} bytes, expected {size}"
+
+    if torrent_path is None or not exists(torrent_path):
+        return hash, None
+
+    with open(torrent_path, "rb") as f:
+        with mmap(f.fileno(), 0, access=ACCESS_READ) as buffer:
+            info = decode(buffer, 0, PIECES_SPEC)[0][b"info"]
+    piece_length = info[b"piece length"]
+    pieces = info[b"pieces"]
+    count = len(pieces) // 20
+    total = sum(size for _, size in files)
+    if count == 0 or (count - 1) * piece_length >= total:
+        return hash, f"file sizes don't match the {count} pieces in {torrent_path}"
+
+    for index in sorted(
+        {0, count - 1} | set(random_sample(range(count), min(sample, count)))
+    ):
+        offset = index * piece_length
+        piece = read_piece(files, offset, min(piece_length, total - offset))
+        if sha1(piece).digest() != pieces[index * 20 : (index + 1) * 20]:
+            return hash, f"piece {index} doesn't match"
+    return hash, None